@@ -0,0 +1,118 @@
+# autosave.py
+#
+# Saves without blocking the game. The main thread only takes a snapshot
+# (savefile.game_to_state, plain dicts and lists, a few microseconds); a
+# worker thread writes it to its save slot (saveslots.write_slot). If saves
+# come in faster than they can be written, only the newest snapshot for each
+# slot is written: older ones waiting behind it are dropped.
+#
+# An AutoSaver also decides when to save on its own, to the 'autosave' slot:
+# after a command that moved the player to another room or completed a
+# quest, and after any command once `interval` seconds have passed since the
+# last autosave.
+#
+# A save that fails is kept in `errors` until the game asks for it: a save
+# the player typed waits for its own file (wait), and failed autosaves are
+# reported the next time the player saves, loads or lists the saves
+# (take_errors).
+
+import threading
+import time
+
+import savefile
+import saveslots
+
+AUTOSAVE_SLOT = 'autosave'
+AUTOSAVE_INTERVAL = 60  # Seconds
+
+# Define the AutoSaver class
+class AutoSaver:
+    def __init__(self, slot=AUTOSAVE_SLOT, interval=AUTOSAVE_INTERVAL):
+        self.slot = slot
+        self.interval = interval
+        self.pending = {}   # {(save directory, slot): newest state waiting to be written}
+        self.writing = False
+        self.condition = threading.Condition()
+        self.closed = False
+        self.requested = 0  # Snapshots taken
+        self.written = 0    # Files written; less than requested when saves were coalesced
+        self.errors = {}    # {(save directory, slot): exception} for failed writes not yet reported
+        self.last_save = time.monotonic()
+        self.last_room = None
+        self.last_quests = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def save(self, game, slot=None):
+        # Snapshot now, write later; called on the game's thread
+        state = savefile.game_to_state(game)
+        with self.condition:
+            self.pending[game.save_dir, slot or self.slot] = state
+            self.requested += 1
+            self.condition.notify_all()
+        if slot is None:
+            self.last_save = time.monotonic()
+
+    def after_command(self, game):
+        # Autosave when the player changed rooms, completed a quest or has played a while
+        if not game.running:
+            return  # A finished game is not worth resuming
+        quests = tuple(quest['completed'] for quest in game.quests.values())
+        moved = self.last_room is not None and game.current_room_name != self.last_room
+        completed = self.last_quests is not None and quests != self.last_quests
+        self.last_room = game.current_room_name
+        self.last_quests = quests
+        if moved or completed or time.monotonic() - self.last_save >= self.interval:
+            self.save(game)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                (directory, slot), state = self.pending.popitem()
+                self.writing = True
+            error = None
+            try:
+                saveslots.write_slot(slot, state, directory)
+                self.written += 1
+            except Exception as e:  # Any failure must reach the player, and must not stop the worker
+                error = e
+            finally:
+                with self.condition:
+                    if error is None:
+                        self.errors.pop((directory, slot), None)  # Written since it last failed
+                    else:
+                        self.errors[directory, slot] = error
+                    self.writing = False
+                    self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        # Wait until everything requested so far is on disk; False on timeout
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.writing or not self.thread.is_alive(), timeout)
+
+    def wait(self, directory, slot, timeout=None):
+        # Wait for a slot's save to be written; returns the exception if it failed
+        if not self.flush(timeout):
+            return TimeoutError(f"still writing after {timeout:g} seconds")
+        with self.condition:
+            return self.errors.pop((directory, slot), None)
+
+    def take_errors(self, directory):
+        # [(slot, exception)] for the failed saves into directory not reported yet
+        with self.condition:
+            failed = [(slot, error) for (folder, slot), error in self.errors.items() if folder == directory]
+            for slot, _ in failed:
+                del self.errors[directory, slot]
+        return failed
+
+    def close(self, timeout=5):
+        # Write what is waiting, then stop the worker
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
@@ -0,0 +1,86 @@
+# background.py
+#
+# The window's background picture, loaded without holding up the first
+# frame. Decoding and scaling a PNG with PIL takes much longer than drawing
+# the empty window, so it happens on a worker thread once the window is up.
+# The scaled picture is cached on disk as a PPM file, a format Tk reads by
+# itself: later launches with the same picture and window size read the
+# cache and never import PIL at all.
+#
+# Tk may only be used from the main thread, so the worker puts its result
+# in a queue and the window picks it up with after() (see GameGUI).
+
+import hashlib
+import os
+import queue
+import threading
+import time
+
+BACKGROUND_IMAGE = 'castle_background.png'
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'adventure_game')
+CACHE_ENTRIES = 4  # Scaled copies kept; older ones (other sizes, replaced pictures) are removed
+
+def cache_path(source, width, height, cache_dir=CACHE_DIR):
+    # A changed picture (new mtime or size) or window size gets a new entry
+    stat = os.stat(source)
+    key = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+    return os.path.join(cache_dir, f"background-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.ppm")
+
+def decode_scaled(source, width, height):
+    # Decode and scale with PIL; returns binary PPM data
+    from PIL import Image  # Only needed when the cache has no copy yet
+    with Image.open(source) as image:
+        image = image.convert('RGB').resize((width, height), Image.LANCZOS)
+    return f"P6\n{width} {height}\n255\n".encode('ascii') + image.tobytes()
+
+def write_cache(path, data):
+    # Write to a temporary file first so a crash never leaves half an image
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+    directory = os.path.dirname(path)
+    entries = [os.path.join(directory, name) for name in os.listdir(directory)
+               if name.startswith('background-') and name.endswith('.ppm')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for old in entries[CACHE_ENTRIES:]:
+        os.remove(old)
+
+def load_background(source, width, height, cache_dir=CACHE_DIR):
+    # Returns (PPM data, True if it came from the cache)
+    path = cache_path(source, width, height, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            return f.read(), True
+    except FileNotFoundError:
+        pass
+    data = decode_scaled(source, width, height)
+    try:
+        write_cache(path, data)
+    except OSError as e:
+        print(f"Could not cache background image: {e}")
+    return data, False
+
+# Define the BackgroundLoader class
+class BackgroundLoader:
+    # Loads the background on a worker thread; poll() from the Tk thread
+    def __init__(self, source, width, height, cache_dir=CACHE_DIR):
+        self.results = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self.run, args=(source, width, height, cache_dir), daemon=True)
+        self.thread.start()
+
+    def run(self, source, width, height, cache_dir):
+        started = time.perf_counter()
+        try:
+            data, cached = load_background(source, width, height, cache_dir)
+            self.results.put((data, cached, None, time.perf_counter() - started))
+        except Exception as e:
+            self.results.put((None, False, e, time.perf_counter() - started))
+
+    def poll(self):
+        # (PPM data or None, from cache, error or None, seconds), or None while still loading
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
@@ -0,0 +1,76 @@
+# bench_batch.py
+#
+# Commands per second when a script is played one command at a time, as the
+# window did for every Return, against Game.run_batch, which plays the same
+# commands as one batch and considers the autosave once at the end. Both
+# games have an AutoSaver attached, as in the window. The window's other
+# saving, drawing the output once per batch instead of once per command,
+# needs a display and is not measured here.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_batch.py --commands 20000 --batch 50
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autosave import AutoSaver
+from commands import split_batch
+from engine import Game
+from headless import HeadlessGUI
+
+# A walk around the ground floor that puts everything back where it was
+SCRIPT = split_batch("west; east; north; get spellbook; south; drop spellbook; look; get spellbook; "
+                     "north; drop spellbook; south; east; get sword; inventory; west; drop sword; "
+                     "get sword; east; drop sword; west")
+
+def new_game(save_dir):
+    gui = HeadlessGUI(on_prompt=lambda prompt: 'attack')
+    game = Game(seed=1)
+    gui.game = game
+    game.save_dir = save_dir
+    game.autosaver = AutoSaver()
+    game.play(gui)
+    game.player.health = 10 ** 9  # The goblin in the Armory must not end the run
+    return game, gui
+
+def run(commands, batch):
+    # Commands per second; batch=0 plays them one at a time
+    save_dir = tempfile.mkdtemp()
+    game, gui = new_game(save_dir)
+    echo = lambda command: gui.display_message(f"\n> {command}", 'input')
+    started = time.perf_counter()
+    if batch:
+        for start in range(0, len(commands), batch):
+            game.run_batch(commands[start:start + batch], echo=echo)
+            gui.take_output()
+    else:
+        for command in commands:
+            echo(command)
+            game.handle_command(command)
+            gui.take_output()
+    elapsed = time.perf_counter() - started
+    saves = game.autosaver.requested
+    game.autosaver.close()
+    shutil.rmtree(save_dir, ignore_errors=True)
+    return len(commands) / elapsed, saves
+
+def main():
+    parser = argparse.ArgumentParser(description="One command at a time against run_batch.")
+    parser.add_argument('--commands', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=50, help="commands per batch")
+    args = parser.parse_args()
+    commands = (SCRIPT * (args.commands // len(SCRIPT) + 1))[:args.commands]
+
+    print(f"{'':<22}{'commands/s':>12}{'autosaves':>11}")
+    for name, batch in (('one at a time', 0), (f"batches of {args.batch}", args.batch)):
+        rate, saves = run(commands, batch)
+        print(f"{name:<22}{rate:>12,.0f}{saves:>11,}")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
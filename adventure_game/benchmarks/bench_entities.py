@@ -0,0 +1,125 @@
+# bench_entities.py
+#
+# Memory per entity and allocations per random spawn: the slotted entities
+# and shared prototypes in entities.py/world.py against the plain __dict__
+# classes and throwaway lists the game used before.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_entities.py
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Game
+from entities import ItemBag, Room
+from world import ENEMY_TYPES, ITEM_TYPES, make_enemy, make_item
+
+# The classes as they were: every instance carries a __dict__ with all fields
+class LegacyItem:
+    def __init__(self, name, description, weight=0, effect=None):
+        self.name = name
+        self.description = description
+        self.weight = weight
+        self.effect = effect
+
+class LegacyEnemy:
+    def __init__(self, name, health, attack, description):
+        self.name = name
+        self.health = health
+        self.attack = attack
+        self.description = description
+
+class LegacyItemBag:
+    def __init__(self):
+        self.stacks = {}
+        self.weight = 0
+        self.size = 0
+        self.frozen = False
+
+class LegacyRoom:
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self.exits = {}
+        self.items = LegacyItemBag()
+        self.enemy = None
+        self.locked = False
+        self.hidden_exits = {}
+
+def legacy_enemy(name):
+    health, attack, description = ENEMY_TYPES[name]
+    return LegacyEnemy(name, health, attack, description)
+
+def legacy_item(name):
+    description, weight, effect = ITEM_TYPES[name]
+    return LegacyItem(name, description, weight, effect)
+
+def legacy_random_enemy(rng):
+    # create_random_enemy used to build every candidate and keep one
+    enemies = [legacy_enemy('Ghost'), legacy_enemy('Zombie'), legacy_enemy('Annoyed Squirrel')]
+    return rng.choice(enemies)
+
+def legacy_random_treasure(rng):
+    treasures = [legacy_item('bag of gold'), legacy_item('gemstone'),
+                 legacy_item('ancient artifact'), legacy_item('whoopee cushion')]
+    return rng.choice(treasures)
+
+def bytes_per_object(factory, count=20000):
+    # Memory still held per object once `count` of them exist
+    make_item('sword')
+    make_enemy('Ghost')
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_size = sys.getsizeof(objects)
+    del objects
+    return (after - before - list_size) / count
+
+def allocations_per_call(function, count=20000):
+    # Bytes allocated during one call, counting objects that are thrown
+    # away before it returns, and bytes still held afterwards
+    function()
+    kept = [None] * count
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    peak = 0
+    for i in range(count):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        kept[i] = function()
+        peak += tracemalloc.get_traced_memory()[1] - before
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return peak / count, retained / count
+
+def main():
+    print(f"{'entity':<10}{'before (B)':>12}{'after (B)':>12}   (items are shared, so a new one costs nothing)")
+    sizes = [
+        ('Item', lambda i: legacy_item('sword'), lambda i: make_item('sword')),
+        ('Enemy', lambda i: legacy_enemy('Ghost'), lambda i: make_enemy('Ghost')),
+        ('Room', lambda i: LegacyRoom('Room', 'A room.'), lambda i: Room('Room', 'A room.')),
+        ('ItemBag', lambda i: LegacyItemBag(), lambda i: ItemBag()),
+    ]
+    for name, before, after in sizes:
+        print(f"{name:<10}{bytes_per_object(before):>12.0f}{max(0, bytes_per_object(after)):>12.0f}")
+
+    game = Game(seed=1)
+    rng = random.Random(1)
+    print(f"\n{'spawn':<16}{'before: peak / kept (B)':>26}{'after: peak / kept (B)':>26}")
+    spawns = [
+        ('random enemy', lambda: legacy_random_enemy(rng), game.create_random_enemy),
+        ('random treasure', lambda: legacy_random_treasure(rng), game.create_random_treasure),
+    ]
+    for name, before, after in spawns:
+        old_peak, old_kept = allocations_per_call(before)
+        new_peak, new_kept = allocations_per_call(after)
+        print(f"{name:<16}{old_peak:>18.0f} / {old_kept:>5.0f}{new_peak:>18.0f} / {new_kept:>5.0f}")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_history.py
+#
+# Memory and restore time of the undo history (history.py) against the
+# alternatives it replaces: keeping a full copy of the game state for every
+# step, and undoing by loading a save from disk.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_history.py --steps 500
+
+import argparse
+import contextlib
+import copy
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from headless import new_session
+from history import History
+
+# Walk around the castle, moving items from room to room
+ROUND = ['north', 'get spellbook', 'south', 'east', 'get sword', 'drop spellbook', 'west',
+         'north', 'get health potion', 'south', 'east', 'get spellbook', 'drop sword', 'west', 'drop spellbook',
+         'drop health potion']
+
+def play(steps, limit):
+    game, gui = new_session(on_prompt=lambda prompt: 'attack', seed=1)
+    game.history = History(limit)
+    game.history.take(game)
+    for step in range(steps):
+        game.player.health = 1000  # Keep random enemies from ending the walk
+        game.handle_command(ROUND[step % len(ROUND)])
+        gui.take_output()
+    return game
+
+def full_copy(game):
+    # A snapshot without sharing: every room, the player and the quests copied
+    return {
+        'rooms': {name: room.copy() for name, room in game.rooms.items()},
+        'player': copy.copy(game.player),
+        'inventory': game.player.inventory.copy(),
+        'quests': copy.deepcopy(game.quests),
+        'room': game.current_room_name,
+    }
+
+def retained(build):
+    # Bytes still allocated after build() returns, while its result is alive
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return kept, size
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the undo history.")
+    parser.add_argument('--steps', type=int, default=500, help="commands played")
+    args = parser.parse_args()
+
+    # The history's cost: the same session keeping every snapshot or only the last one
+    game, with_history = retained(lambda: play(args.steps, args.steps + 1))
+    _, without = retained(lambda: play(args.steps, 1))
+    snapshots = len(game.history)
+    shared = with_history - without
+    _, copies = retained(lambda: [full_copy(game) for _ in range(snapshots)])
+
+    rewinds = min(200, len(game.history) - 1)
+    started = time.perf_counter()
+    for _ in range(rewinds):
+        game.history.rewind(game, 1)
+    rewind = (time.perf_counter() - started) / rewinds
+
+    os.chdir(tempfile.mkdtemp())
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.save_game('bench')
+        started = time.perf_counter()
+        for _ in range(50):
+            game.load_game('bench')
+        load = (time.perf_counter() - started) / 50
+
+    print(f"{args.steps} commands, {snapshots} snapshots")
+    print(f"shared snapshots    {shared / 1024:9.1f} KB  ({shared / snapshots:.0f} bytes each)")
+    print(f"full copies         {copies / 1024:9.1f} KB  ({copies / snapshots:.0f} bytes each)")
+    print(f"undo one step       {rewind * 1e6:9.1f} us")
+    print(f"load a save         {load * 1e6:9.1f} us")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
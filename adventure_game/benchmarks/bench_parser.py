@@ -0,0 +1,69 @@
+# bench_parser.py
+#
+# Commands parsed per second: the verb table in commands.py against the
+# if/elif chain handle_command used to walk for every command.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_parser.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import COMMANDS
+
+# A mix of common, late-in-the-chain and unknown commands
+SAMPLE = ['north', 'look', 'get sword', 'drop sword', 'inventory', 'use health potion',
+          'talk', 'help', 'complete quest', 'dance', 'west', 'search']
+
+def legacy_parse(action):
+    # The old chain, returning (verb, argument) instead of running the handler
+    if action in ['quit', 'exit']:
+        return 'quit', ''
+    elif action in ['north', 'south', 'east', 'west', 'up', 'down']:
+        return action, ''
+    elif action == 'search':
+        return 'search', ''
+    elif action == 'look':
+        return 'look', ''
+    elif action.startswith('get '):
+        return 'get', action[4:]
+    elif action.startswith('drop '):
+        return 'drop', action[5:]
+    elif action.startswith('use '):
+        return 'use', action[4:]
+    elif action == 'inventory':
+        return 'inventory', ''
+    elif action == 'save':
+        return 'save', ''
+    elif action == 'load':
+        return 'load', ''
+    elif action == 'accept quest':
+        return 'accept quest', ''
+    elif action == 'complete quest':
+        return 'complete quest', ''
+    elif action == 'instructions':
+        return 'instructions', ''
+    elif action == 'help':
+        return 'help', ''
+    elif action == 'talk':
+        return 'talk', ''
+    return None, ''
+
+def rate(function, number):
+    seconds = timeit.timeit(lambda: [function(action) for action in SAMPLE], number=number)
+    return number * len(SAMPLE) / seconds
+
+def main(number=20000):
+    results = [
+        ('if/elif chain', rate(legacy_parse, number)),
+        ('verb table', rate(COMMANDS.parse, number)),
+    ]
+    for name, per_second in results:
+        print(f"{name:<15}{per_second:>14,.0f} commands/sec")
+    return results
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench_render.py
+#
+# Showing a room with its rendered view cached on the room (Game.room_view)
+# against building the text again every time, as display_location did
+# before. Rooms are timed idle and crowded with items, and random-agent
+# playthroughs report how often a room is shown from the cache.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_render.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Game, GameInterface
+from headless import HeadlessGUI
+from montecarlo import RandomAgent
+
+# Define the NullGUI class
+class NullGUI(GameInterface):
+    # Throws output away, so only the engine's own work is timed
+    def display_message(self, message, msg_type='system'):
+        pass
+
+# Define the CountingGame class
+class CountingGame(Game):
+    shown = 0
+    rendered = 0
+
+    def display_location(self):
+        CountingGame.shown += 1
+        super().display_location()
+
+    def room_view(self, room):
+        CountingGame.rendered += 1
+        return super().room_view(room)
+
+def new_game(commands):
+    gui = NullGUI()
+    game = Game(seed=1)
+    game.play(gui)
+    for command in commands:
+        game.handle_command(command)
+    return game
+
+def time_display(game, cached, repeat=20000):
+    # ns per display_location; without the cache the view is dropped before every call
+    room = game.current_room
+    started = time.perf_counter_ns()
+    for _ in range(repeat):
+        if not cached:
+            room.view = None
+        game.display_location()
+    return (time.perf_counter_ns() - started) / repeat
+
+def hit_rate(sessions=300, max_steps=200):
+    for seed in range(sessions):
+        agent = RandomAgent(seed)
+        gui = HeadlessGUI(on_prompt=agent.answer)
+        game = CountingGame(seed=seed)
+        gui.game = game
+        game.play(gui)
+        for _ in range(max_steps):
+            if not game.running or not game.player.is_alive():
+                break
+            game.handle_command(agent.choose(game))
+            gui.take_output()
+    return CountingGame.shown, CountingGame.rendered
+
+def main():
+    crowded = new_game([])
+    room = crowded.rooms.edit(crowded.current_room_name)
+    for index in range(200):
+        room.items.add(crowded.create_item(['bag of gold', 'gemstone', 'ancient artifact', 'key', 'sword'][index % 5]))
+    for _ in range(40):
+        room.items.add(crowded.create_item('health potion'))
+
+    cases = [('idle room (Library)', new_game(['north'])), ('crowded hall (240 items)', crowded)]
+    print(f"{'room':<28}{'rebuilt ns':>12}{'cached ns':>12}{'speedup':>10}")
+    for name, game in cases:
+        rebuilt = time_display(game, cached=False)
+        cached = time_display(game, cached=True)
+        print(f"{name:<28}{rebuilt:>12,.0f}{cached:>12,.0f}{rebuilt / cached:>9.1f}x")
+
+    shown, rendered = hit_rate()
+    print(f"\nRandom playthroughs: {shown} rooms shown, {rendered} rendered, "
+          f"{1 - rendered / shown:.0%} served from the cache")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
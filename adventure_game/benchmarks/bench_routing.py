@@ -0,0 +1,136 @@
+# bench_routing.py
+#
+# Route queries on a large in-memory grid of rooms and on a paged world of
+# the same size written by worldgen.py. For each world: a 'go to' a few
+# rooms away and one to a random room (the search stops at the target),
+# repeated queries answered from the cached trees, searching everything
+# reachable (what every first query used to cost), and unlocking a door
+# (drop the affected trees, search again). On the paged world it also
+# reports how many room records each step read, and checks that routing
+# left the pager's cache of rooms around the player alone.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_routing.py --rooms 40000
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities import Room
+from routing import Router
+from world import World, WorldTemplate
+from world_data import PagedWorldTemplate
+from worldgen import write_generated
+
+def grid_world(rooms, locked_share=0.02, seed=1):
+    # A square grid with exits between neighbours and a few locked rooms
+    rng = random.Random(seed)
+    side = int(rooms ** 0.5)
+    grid = {}
+    for y in range(side):
+        for x in range(side):
+            grid[x, y] = Room(f"Room {x},{y}", "A generated room.")
+    for (x, y), room in grid.items():
+        for direction, (dx, dy) in [('north', (0, -1)), ('south', (0, 1)), ('east', (1, 0)), ('west', (-1, 0))]:
+            neighbour = grid.get((x + dx, y + dy))
+            if neighbour:
+                room.add_exit(direction, neighbour)
+        room.locked = (x, y) != (0, 0) and rng.random() < locked_share
+    rooms = {room.name: room for room in grid.values()}
+    return WorldTemplate(rooms, "Room 0,0", None, 'ring of power')
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+def nearby(world, start, steps, rng):
+    # A room a short random walk from start, as a player would 'go to' one they have seen
+    name = start
+    for _ in range(steps):
+        exits, locked = world.route_info(name)
+        if locked and name != start or not exits:
+            break
+        name = rng.choice(list(exits.values()))
+    return name
+
+def run(label, world, queries, loads):
+    # loads() is the number of room records read so far, or None for an in-memory world
+    start = world.template.start
+    rng = random.Random(2)
+    names = list(world.keys())
+    targets = [rng.choice(names) for _ in range(queries)]
+    near = [nearby(world, start, 8, rng) for _ in range(queries)]
+
+    def report(name, seconds, per=1, before=None, unit='ms'):
+        scale = 1000 if unit == 'ms' else 1e6
+        line = f"  {name:<28}{seconds / per * scale:10.1f} {unit}"
+        if before is not None:
+            line += f"  ({loads() - before:,} records read)"
+        print(line)
+
+    print(f"{label}: {len(world):,} rooms")
+    router = Router(world)
+    before = loads() if loads else None
+    _, near_first = timed(lambda: router.route(start, near[0]))
+    report("first 'go to' nearby", near_first, before=before, unit='us')
+    before = loads() if loads else None
+    _, far_first = timed(lambda: router.route(start, targets[0]))
+    report("first 'go to' random room", far_first, before=before)
+    _, growing = timed(lambda: [router.route(start, target) for target in targets])
+    report("random rooms, tree growing", growing, queries, unit='us')
+    _, cached = timed(lambda: [router.route(start, target) for target in targets])
+    report("route, tree cached", cached, queries, unit='us')
+    _, reach = timed(lambda: [router.reachable(start, target) for target in targets])
+    report("reachable, tree cached", reach, queries, unit='us')
+
+    full = Router(world)
+    before = loads() if loads else None
+    tree, whole = timed(lambda: full.search(full.tree(start)))
+    report("search everything", whole, before=before)
+    print(f"  {len(tree):,} rooms reachable from the start, {len(tree.locked):,} locked doors at the edge")
+
+    door = next(iter(tree.locked))
+    world.edit(door).locked = False
+    _, unlock = timed(lambda: (router.changed(door), router.route(start, door)))
+    report("unlock + route again", unlock)
+
+    # Routes from many rooms, as players move about; the cache stays within its budget
+    many = Router(world)
+    sources = [rng.choice(names) for _ in range(200)]
+    _, spread = timed(lambda: [many.route(source, target) for source, target in zip(sources, targets)])
+    report("routes from 200 rooms", spread, len(sources))
+    print(f"  cache: {len(many.trees)} trees, {many.entries:,} rooms (budget {many.cache_entries:,})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached room routing.")
+    parser.add_argument('--rooms', type=int, default=40000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    run("in-memory grid", World(grid_world(args.rooms)), args.queries, None)
+
+    directory = tempfile.mkdtemp(prefix='bench-routing-')
+    try:
+        path = os.path.join(directory, 'world.jsonl')
+        write_generated(path, args.rooms, seed=1)
+        template = PagedWorldTemplate(path)
+        world = World(template)
+        world.visit(template.start)
+        around = set(template.rooms.cache)
+        print()
+        run("paged world (worldgen.py)", world, args.queries, lambda: template.rooms.loads)
+        kept = around <= set(template.rooms.cache)
+        print(f"  rooms around the player still cached: {'yes' if kept else 'no'}")
+        template.rooms.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+# Main entry point
+if __name__ == "__main__":
+    main()
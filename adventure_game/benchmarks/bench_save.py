@@ -0,0 +1,62 @@
+# bench_save.py
+#
+# Compare the compact save format with the old whole-object pickle of
+# Game.__dict__: size on disk and time per save/load round trip.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_save.py
+
+import copy
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import savefile
+from headless import run_commands
+
+# A session with some progress: items moved, an enemy killed, a door unlocked
+COMMANDS = ['north', 'east', 'get key', 'west', 'north', 'get mysterious amulet', 'south',
+            'south', 'west', 'search', 'north', 'get magic lamp', 'south', 'east', 'east']
+ANSWERS = ['echo'] + ['attack'] * 10
+
+def legacy_state(game):
+    # What Game.save_game used to pickle: Game.__dict__ with every room
+    # materialized, not just the ones the player changed
+    state = game.__dict__.copy()
+    # The gui, command table, trigger hooks, router, RNG, command log and undo history were never part of a save
+    for name in ('gui', 'commands', 'triggers', 'router', 'rng', 'log', 'history'):
+        del state[name]
+    state['player'] = copy.copy(game.player)
+    state['player'].on_change = None
+    state['rooms'] = {name: room.copy() for name, room in game.rooms.items()}
+    return state
+
+def legacy_dumps(state):
+    return pickle.dumps(state.copy())
+
+def legacy_loads(data):
+    return pickle.loads(data)
+
+def main(number=2000):
+    game, gui = run_commands(COMMANDS, ANSWERS)
+    state = legacy_state(game)
+    legacy = legacy_dumps(state)
+    compact = savefile.dumps(game)
+    results = [
+        ('pickle', len(legacy),
+         timeit.timeit(lambda: legacy_dumps(state), number=number) / number,
+         timeit.timeit(lambda: legacy_loads(legacy), number=number) / number),
+        ('compact', len(compact.encode('utf-8')),
+         timeit.timeit(lambda: savefile.dumps(game), number=number) / number,
+         timeit.timeit(lambda: savefile.loads(game, compact), number=number) / number),
+    ]
+    print(f"{'format':<10}{'bytes':>8}{'save (us)':>12}{'load (us)':>12}")
+    for name, size, save_time, load_time in results:
+        print(f"{name:<10}{size:>8}{save_time * 1e6:>12.1f}{load_time * 1e6:>12.1f}")
+    return results
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench_shared.py
+#
+# Throughput of a shared world (world.SharedWorld) as players are added, with
+# one thread per player as in server.py. Two ways of locking the world are
+# compared over exactly the same critical sections (every lock(name) the
+# engine takes):
+#   world   one RLock for every room: a player reading or changing any room
+#           waits for whoever holds any other
+#   rooms   the engine's per-room locks
+# Neither holds a lock while a prompt waits for its answer, which arrives
+# after --latency seconds, like a client's round trip. The critical
+# sections are short and never release the interpreter lock, so Python
+# runs them one at a time either way; expect the two to be close.
+#
+# The castle is read into memory (world_data.read_world), as the server does.
+# With --paged it is played from the paged template instead, where every
+# room read takes the RoomPager's one lock and updates its LRU.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_shared.py --players 1 2 4 8 16 32
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Game
+from headless import HeadlessGUI
+from loadgen import answer_for
+from world import SharedWorld
+from world_data import default_world, read_world
+
+# Around the ground floor: talk to the stranger (a prompt), carry items into
+# the Entrance Hall and take them back, so every round starts from the same world
+ROUND = ['west', 'talk', 'east', 'north', 'get spellbook', 'south', 'drop spellbook', 'look',
+         'get spellbook', 'north', 'drop spellbook', 'south', 'east', 'get sword', 'west',
+         'drop sword', 'get sword', 'east', 'drop sword', 'west']
+
+# Define the OneLockWorld class
+class OneLockWorld(SharedWorld):
+    # A SharedWorld whose rooms all share one lock
+    def __init__(self, template):
+        super().__init__(template)
+        self.world_lock = threading.RLock()
+
+    def lock(self, name):
+        return self.world_lock
+
+def play(world, latency, stop, counts, index):
+    def on_prompt(prompt):
+        time.sleep(latency)
+        return answer_for(prompt)
+    gui = HeadlessGUI(on_prompt=on_prompt)
+    game = Game(shared=world, seed=index)
+    gui.game = game
+    game.play(gui)
+    step = 0
+    while not stop.is_set():
+        game.player.health = 1000  # Keep fights from ending the run
+        game.handle_command(ROUND[step % len(ROUND)])
+        gui.take_output()
+        step += 1
+    counts[index] = step
+
+def run(players, mode, seconds, latency, paged=False):
+    # Commands per second for all players together
+    template = default_world() if paged else read_world()
+    world = OneLockWorld(template) if mode == 'world' else SharedWorld(template)
+    stop = threading.Event()
+    counts = [0] * players
+    threads = [threading.Thread(target=play, args=(world, latency, stop, counts, index))
+               for index in range(players)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-world throughput as players are added.")
+    parser.add_argument('--players', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--seconds', type=float, default=1.0, help="time each configuration runs")
+    parser.add_argument('--latency', type=float, default=0.002, help="seconds before a prompt is answered")
+    parser.add_argument('--paged', action='store_true', help="play the paged castle instead of one read into memory")
+    args = parser.parse_args()
+
+    print(f"{'players':>8}{'world cmd/s':>14}{'rooms cmd/s':>14}{'rooms/world':>13}")
+    for players in args.players:
+        single = run(players, 'world', args.seconds, args.latency, args.paged)
+        rooms = run(players, 'rooms', args.seconds, args.latency, args.paged)
+        print(f"{players:>8}{single:>14,.0f}{rooms:>14,.0f}{rooms / single:>12.2f}x")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_slots.py
+#
+# Listing save slots: from the index kept in memory, from the index read
+# from disk (the first listing in a process), and by opening every save
+# file, which is what listing cost when a save's details were only inside
+# the save itself. Also times writing one slot, index update included.
+#
+# Run from the adventure_game directory:  python benchmarks/bench_slots.py --slots 500
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import savefile
+import saveslots
+from headless import run_commands
+
+COMMANDS = ['north', 'get spellbook', 'south', 'east', 'get sword', 'west']
+ANSWERS = ['attack'] * 10
+
+def list_by_reading_saves(directory):
+    # The old way: every save is read and parsed to show a line about it
+    slots = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json') and name != saveslots.INDEX_FILE:
+            path = os.path.join(directory, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            slots.append((name[:-len('.json')], saveslots.summary(state, os.path.getmtime(path))))
+    return slots
+
+def best_of(function, repeat=5):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time listing save slots.")
+    parser.add_argument('--slots', type=int, default=500, help="number of save slots to create")
+    args = parser.parse_args()
+
+    game, _ = run_commands(COMMANDS, ANSWERS, seed=1)
+    state = savefile.game_to_state(game)
+    directory = tempfile.mkdtemp()
+    # Write the saves directly and the index once, rather than one save at a time
+    index = {}
+    for number in range(args.slots):
+        slot = f"slot-{number}"
+        savefile.write_atomic(saveslots.slot_path(slot, directory), json.dumps(state, separators=(',', ':')))
+        index[slot] = saveslots.summary(state, time.time())
+    saveslots.write_index(index, directory)
+
+    assert len(saveslots.list_slots(directory)) == len(list_by_reading_saves(directory)) == args.slots
+    indexed = best_of(lambda: saveslots.list_slots(directory))
+    cold = best_of(lambda: (saveslots._indexes.clear(), saveslots.list_slots(directory)))
+    scanned = best_of(lambda: list_by_reading_saves(directory))
+    save = best_of(lambda: saveslots.write_slot('slot-0', state, directory))
+    print(f"{args.slots} slots")
+    print(f"list from index          {indexed * 1000:8.2f} ms")
+    print(f"list, index from disk    {cold * 1000:8.2f} ms")
+    print(f"list by reading saves    {scanned * 1000:8.2f} ms  ({scanned / cold:.0f}x slower than from disk)")
+    print(f"save one slot + index    {save * 1000:8.2f} ms")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# suite.py
+#
+# Benchmarks for the engine's hot paths, runnable without a display:
+# building a world, handle_command for movement, get/drop (also with the
+# undo history on) and inventory, display_location, save/load round trips
+# and combat. Results are written as
+# JSON and compared against a stored baseline; anything slower than the
+# baseline by more than the tolerance is reported and the exit status is 1.
+#
+# Run from the adventure_game directory:
+#   python benchmarks/suite.py                     compare with benchmarks/baseline.json
+#   python benchmarks/suite.py --output run.json   also write this run's results
+#   python benchmarks/suite.py --save-baseline     replace the baseline with this run
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Game, GameInterface
+from world import make_enemy
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Define the NullInterface class
+class NullInterface(GameInterface):
+    # Output sink that only counts what it is given; every prompt is answered with 'attack'
+    def __init__(self):
+        self.messages = 0
+        self.characters = 0
+
+    def display_message(self, message, msg_type='system'):
+        self.messages += 1
+        self.characters += len(message)
+
+    def get_player_input(self, prompt=""):
+        return 'attack'
+
+def new_game(history=False):
+    gui = NullInterface()
+    game = Game(seed=1, history=history)
+    game.play(gui)
+    return game
+
+# Each benchmark is given an ExitStack for anything to remove once the run
+# is over, and returns (function, operations per call of function)
+def bench_create_world(cleanup):
+    game = new_game()
+    return game.create_world, 1
+
+def bench_move(cleanup):
+    game = new_game()
+    return lambda: (game.handle_command('north'), game.handle_command('south')), 2
+
+def bench_get_drop(cleanup, history=False):
+    game = new_game(history)
+    game.handle_command('north')  # The Library, with a spellbook and no enemy
+    return lambda: (game.handle_command('get spellbook'), game.handle_command('drop spellbook')), 2
+
+def bench_get_drop_undo(cleanup):
+    # The same with a snapshot taken after every command, as in the window
+    return bench_get_drop(cleanup, history=True)
+
+def bench_inventory(cleanup):
+    game = new_game()
+    game.handle_command('north')
+    game.handle_command('get spellbook')
+    return lambda: game.handle_command('inventory'), 1
+
+def bench_display_location(cleanup):
+    game = new_game()
+    game.handle_command('north')
+    return game.display_location, 1
+
+def bench_save_load(cleanup):
+    game = new_game()
+    for command in ['north', 'get spellbook', 'south', 'east', 'get sword']:
+        game.handle_command(command)
+    game.save_dir = cleanup.enter_context(tempfile.TemporaryDirectory())
+    def round_trip():
+        # save_game and load_game report to stdout; keep that out of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.save_game('bench')
+            game.load_game('bench')
+    return round_trip, 1
+
+def bench_combat(cleanup):
+    game = new_game()
+    def fight():
+        game.player.health = 1000
+        game.combat(make_enemy('Dragon'))
+    return fight, 1
+
+BENCHMARKS = {
+    'create_world': bench_create_world,
+    'handle_command.move': bench_move,
+    'handle_command.get_drop': bench_get_drop,
+    'handle_command.get_drop_undo': bench_get_drop_undo,
+    'handle_command.inventory': bench_inventory,
+    'display_location': bench_display_location,
+    'save_load_round_trip': bench_save_load,
+    'combat.dragon': bench_combat,
+}
+
+def timed_loop(function, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - started
+
+def measure(function, operations, min_time=0.5, sample_time=0.005):
+    # Nanoseconds per operation: the fastest of many short samples. On a busy
+    # machine the minimum of many small samples is far steadier than an average.
+    loops = 1
+    while timed_loop(function, loops) < sample_time:
+        loops *= 2
+    samples = max(5, int(min_time / sample_time))
+    # Like timeit, keep the garbage collector from landing in one sample but not another
+    gc.collect()
+    gc.disable()
+    try:
+        best = min(timed_loop(function, loops) for _ in range(samples))
+    finally:
+        gc.enable()
+    return best / (loops * operations) * 1e9
+
+def run(names=None, min_time=0.5, rounds=5):
+    # Benchmarks take turns over several rounds and keep their best result,
+    # so a slow spell on the machine does not land on one benchmark only
+    best = {}
+    with contextlib.ExitStack() as cleanup:
+        benchmarks = {name: setup(cleanup) for name, setup in BENCHMARKS.items() if not names or name in names}
+        for _ in range(rounds):
+            for name, (function, operations) in benchmarks.items():
+                ns = measure(function, operations, min_time / rounds)
+                best[name] = min(ns, best.get(name, ns))
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {name: {'ns_per_op': round(ns, 1)} for name, ns in best.items()},
+    }
+
+def compare(current, baseline, tolerance):
+    # Returns [(name, baseline ns, current ns, ratio, regressed)]
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            rows.append((name, None, result['ns_per_op'], None, False))
+            continue
+        ratio = result['ns_per_op'] / before['ns_per_op']
+        rows.append((name, before['ns_per_op'], result['ns_per_op'], ratio, ratio > 1 + tolerance))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths.")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: all)")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON to compare with")
+    parser.add_argument('--output', help="write this run's results to a JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown before a result counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="seconds spent timing each benchmark")
+    parser.add_argument('--rounds', type=int, default=5, help="times each benchmark is timed; the best counts")
+    args = parser.parse_args()
+
+    current = run(args.names, args.min_time, args.rounds)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+            f.write('\n')
+        print(f"Saved baseline to {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    # A slow result is timed again before it is reported; a real regression stays slow
+    for _ in range(2):
+        slow = [row[0] for row in compare(current, baseline, args.tolerance) if row[4]]
+        if not slow:
+            break
+        for name, result in run(slow, args.min_time, args.rounds)['results'].items():
+            current['results'][name]['ns_per_op'] = min(current['results'][name]['ns_per_op'], result['ns_per_op'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+    print(f"{'benchmark':<28}{'baseline ns':>14}{'now ns':>12}{'change':>9}")
+    regressions = 0
+    for name, before, now, ratio, regressed in compare(current, baseline, args.tolerance):
+        before_text = '-' if before is None else f"{before:,.0f}"
+        change = '' if ratio is None else f"{ratio - 1:+.0%}"
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:<28}{before_text:>14}{now:>12,.0f}{change:>9}{flag}")
+        regressions += regressed
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# combat_sim.py
+#
+# Batch combat simulator for balancing. Combat in Game.combat is a fixed
+# exchange: the player hits for `attack`, then the enemy hits back for its
+# attack if still alive, until one side drops to 0. That makes every fight a
+# closed-form calculation, so whole grids of player stats, item loadouts and
+# enemies are evaluated at once with NumPy instead of one prompt at a time.
+#
+# Needs NumPy:  pip install numpy
+# Run with:     python combat_sim.py
+
+import argparse
+import time
+
+import numpy as np
+
+from entities import Player
+from world import ITEM_TYPES, ENEMY_TYPES
+
+# What each item effect does to (health, attack) when the item is picked up
+EFFECT_STATS = {
+    'heal_player': (30, 0),
+    'increase_attack': (0, 10),
+    'increase_attack_power': (0, 20),
+    'increase_attack_power_quest': (0, 15),
+}
+
+# Loadouts worth comparing; items without an effect (like the sword) add nothing
+LOADOUTS = {
+    'nothing': [],
+    'sword': ['sword'],
+    'ancient sword': ['ancient sword'],
+    'amulet': ['mysterious amulet'],
+    'sword + amulet': ['ancient sword', 'mysterious amulet'],
+    'ring of power': ['ring of power'],
+    '2 potions': ['health potion', 'health potion'],
+    'everything': ['ancient sword', 'mysterious amulet', 'ring of power',
+                   'health potion', 'health potion', 'health potion'],
+}
+
+def loadout_bonus(items):
+    # (health, attack) added by picking up these items
+    health = attack = 0
+    for name in items:
+        effect = ITEM_TYPES[name][2]
+        if effect:
+            extra_health, extra_attack = EFFECT_STATS[effect]
+            health += extra_health
+            attack += extra_attack
+    return health, attack
+
+def simulate(health, attack, enemy_health, enemy_attack):
+    # Resolve fights elementwise; all arguments broadcast against each other.
+    # Returns a dict of arrays: win, turns (player attacks made) and the
+    # player's remaining health (0 or less means the player died).
+    health, attack, enemy_health, enemy_attack = np.broadcast_arrays(
+        np.asarray(health, dtype=np.int64), np.asarray(attack, dtype=np.int64),
+        np.asarray(enemy_health, dtype=np.int64), np.asarray(enemy_attack, dtype=np.int64))
+    # Hits the player needs, and hits the player can take before dying
+    hits_to_kill = -(-enemy_health // np.maximum(attack, 1))
+    hits_to_die = np.where(enemy_attack > 0, -(-health // np.maximum(enemy_attack, 1)), np.iinfo(np.int64).max)
+    # The enemy only strikes back after a hit that did not kill it
+    win = (attack > 0) & (hits_to_kill - 1 < hits_to_die)
+    turns = np.where(win, hits_to_kill, hits_to_die)
+    remaining = np.where(win, health - (hits_to_kill - 1) * enemy_attack, health - hits_to_die * enemy_attack)
+    return {'win': win, 'turns': turns, 'remaining': remaining}
+
+def simulate_gauntlet(health, attack, enemies):
+    # Fight the enemies in order, carrying health over between fights
+    health = np.asarray(health, dtype=np.int64)
+    alive = np.ones(np.broadcast(health, attack).shape, dtype=bool)
+    turns = np.zeros(alive.shape, dtype=np.int64)
+    for name in enemies:
+        enemy_health, enemy_attack, _ = ENEMY_TYPES[name]
+        result = simulate(health, attack, enemy_health, enemy_attack)
+        turns = turns + np.where(alive, result['turns'], 0)
+        alive = alive & result['win']
+        health = np.where(alive, result['remaining'], np.minimum(health, result['remaining']))
+    return {'win': alive, 'turns': turns, 'remaining': health}
+
+def stat_grid(loadouts, enemies, healths, attacks):
+    # Every combination of base health x base attack x loadout x enemy.
+    # Returns the simulate() result with shape (health, attack, loadout, enemy).
+    bonuses = np.array([loadout_bonus(items) for items in loadouts], dtype=np.int64).reshape(-1, 2)
+    enemy_stats = np.array([ENEMY_TYPES[name][:2] for name in enemies], dtype=np.int64).reshape(-1, 2)
+    health = np.asarray(healths, dtype=np.int64)[:, None, None, None] + bonuses[None, None, :, 0, None]
+    attack = np.asarray(attacks, dtype=np.int64)[None, :, None, None] + bonuses[None, None, :, 1, None]
+    return simulate(health, attack, enemy_stats[:, 0], enemy_stats[:, 1])
+
+def summarize(result, loadout_names, enemy_names):
+    # Win rate, turns and remaining health percentiles per (loadout, enemy)
+    rows = []
+    for l, loadout in enumerate(loadout_names):
+        for e, enemy in enumerate(enemy_names):
+            win = result['win'][:, :, l, e]
+            turns = result['turns'][:, :, l, e]
+            remaining = result['remaining'][:, :, l, e][win]
+            rows.append({
+                'loadout': loadout,
+                'enemy': enemy,
+                'fights': win.size,
+                'win_rate': float(win.mean()),
+                'turns_mean': float(turns.mean()),
+                'turns_p90': float(np.percentile(turns, 90)),
+                'remaining_p10': float(np.percentile(remaining, 10)) if remaining.size else None,
+                'remaining_p50': float(np.percentile(remaining, 50)) if remaining.size else None,
+            })
+    return rows
+
+def main():
+    player = Player()
+    parser = argparse.ArgumentParser(description="Evaluate combat balance over a grid of player stats.")
+    parser.add_argument('--health', type=int, nargs=2, default=[player.health // 2, player.health * 2],
+                        metavar=('MIN', 'MAX'), help="base player health range")
+    parser.add_argument('--attack', type=int, nargs=2, default=[5, player.attack * 4],
+                        metavar=('MIN', 'MAX'), help="base player attack range")
+    parser.add_argument('--enemies', nargs='*', default=list(ENEMY_TYPES))
+    args = parser.parse_args()
+
+    healths = np.arange(args.health[0], args.health[1] + 1)
+    attacks = np.arange(args.attack[0], args.attack[1] + 1)
+    started = time.perf_counter()
+    result = stat_grid(list(LOADOUTS.values()), args.enemies, healths, attacks)
+    elapsed = time.perf_counter() - started
+    print(f"{result['win'].size:,} fights in {elapsed * 1000:.1f} ms\n")
+    print(f"{'loadout':<16}{'enemy':<18}{'win rate':>9}{'turns':>7}{'hp p10':>8}{'hp p50':>8}")
+    for row in summarize(result, list(LOADOUTS), args.enemies):
+        p10 = '-' if row['remaining_p10'] is None else f"{row['remaining_p10']:.0f}"
+        p50 = '-' if row['remaining_p50'] is None else f"{row['remaining_p50']:.0f}"
+        print(f"{row['loadout']:<16}{row['enemy']:<18}{row['win_rate']:>9.1%}{row['turns_mean']:>7.1f}{p10:>8}{p50:>8}")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
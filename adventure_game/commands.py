@@ -0,0 +1,99 @@
+# commands.py
+#
+# Table-driven command parser. Full verbs and aliases are found with one dict
+# lookup; anything else walks a character trie, which matches abbreviations
+# and splits verb from argument in a single pass. Game content can add its own
+# verbs with CommandTable.register. Several commands can be given at once,
+# separated by ';' or one per line of a script file (see Game.run_batch).
+
+BATCH_SEPARATOR = ';'
+
+def split_batch(text):
+    # 'north; get key; south' -> ['north', 'get key', 'south']
+    return [command.strip() for command in text.split(BATCH_SEPARATOR) if command.strip()]
+
+def read_script(path):
+    # Commands from a script file: one or more per line, '#' starts a comment
+    commands = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            commands.extend(split_batch(line.split('#', 1)[0]))
+    return commands
+
+# Define the Command class
+class Command:
+    def __init__(self, verb, handler, argument=False, end_turn=True, optional=False):
+        self.verb = verb
+        self.handler = handler    # function(game) or function(game, argument)
+        self.argument = argument  # True if the verb takes an argument ('get [item]')
+        self.end_turn = end_turn  # False skips combat and quest checks afterwards
+        self.optional = optional  # True if the argument may be left out ('save [slot]')
+
+    def run(self, game, argument=''):
+        if self.argument:
+            return self.handler(game, argument)
+        return self.handler(game)
+
+# Define the TrieNode class
+class TrieNode:
+    __slots__ = ('children', 'command', 'reachable')
+
+    def __init__(self):
+        self.children = {}
+        self.command = None     # Command whose verb or alias ends exactly here
+        self.reachable = set()  # Commands that may be abbreviated to this prefix
+
+# Define the CommandTable class
+class CommandTable:
+    def __init__(self):
+        self.root = TrieNode()
+        self.commands = {}  # {verb: Command}
+        self.words = {}     # {verb or alias: Command}
+
+    def register(self, verb, handler, aliases=(), argument=False, prefix=True, end_turn=True, optional=False):
+        # prefix=False means the verb must be typed in full (e.g. 'quit')
+        command = Command(verb, handler, argument, end_turn, optional)
+        self.commands[verb] = command
+        self.add_word(verb, command, prefix)
+        for alias in aliases:
+            self.add_word(alias, command, prefix=False)
+        return command
+
+    def add_word(self, word, command, prefix):
+        self.words[word] = command
+        node = self.root
+        for char in word:
+            node = node.children.setdefault(char, TrieNode())
+            if prefix:
+                node.reachable.add(command)
+        node.command = command
+
+    def parse(self, text):
+        # Returns (command, argument), or (None, '') if nothing matches
+        command = self.words.get(text)
+        if command:
+            return command, ''
+        verb, _, argument = text.partition(' ')
+        command = self.words.get(verb)
+        if command and command.argument:
+            return command, argument.strip()
+        node = self.root
+        fallback = None
+        for position, char in enumerate(text):
+            if char == ' ':
+                # 'get sword' or an abbreviation such as 'dr sword'
+                command = node.command or self.unique(node)
+                if command and command.argument:
+                    fallback = (command, text[position + 1:].strip())
+            node = node.children.get(char)
+            if node is None:
+                return fallback or (None, '')
+        command = node.command or self.unique(node)
+        if command:
+            return command, ''
+        return fallback or (None, '')
+
+    def unique(self, node):
+        if len(node.reachable) == 1:
+            return next(iter(node.reachable))
+        return None
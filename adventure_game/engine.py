@@ -0,0 +1,694 @@
+# engine.py
+#
+# Game logic for the adventure. Nothing in here imports tkinter or PIL: the
+# engine only talks to a GameInterface, which can be the tkinter GameGUI or
+# the in-memory HeadlessGUI from headless.py.
+
+import os
+import random
+import time
+
+import instrument
+import savefile
+import saveslots
+from commands import CommandTable
+from history import History
+from quests import QuestTracker, STORY
+from entities import Player
+from world import World, RANDOM_ENEMIES, RANDOM_TREASURES, make_item, make_enemy
+from world_data import default_world, load_world
+from routing import Router
+
+# Rooms with more kinds of items than this get a summarized listing
+ROOM_LISTING_LIMIT = 10
+
+# Seconds 'save' waits for the autosaver to write its file
+SAVE_TIMEOUT = 10
+
+# Define the interface the engine talks to
+class GameInterface:
+    # Show one line of output; msg_type is one of the text tags
+    # ('system', 'player', 'enemy', 'input', 'npc')
+    def display_message(self, message, msg_type='system'):
+        raise NotImplementedError
+
+    # Ask the player a question (riddle, combat, stranger) and return the answer
+    def get_player_input(self, prompt=""):
+        raise NotImplementedError
+
+    # Called once the game has ended and the engine has stopped running
+    def game_over(self):
+        pass
+
+    # Called for the 'quit' command
+    def quit_game(self):
+        pass
+
+# Define the Game class
+class Game:
+    def __init__(self, world=None, seed=None, shared=None, history=False):
+        self.world = world         # Path of a world data file; None for the castle
+        self.shared = shared       # world.SharedWorld played together with other games, or None
+        # Every game has its own seeded RNG, so a session can be reproduced from its seed and log
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.log = []              # Append-only: ('command', text), ('answer', text) and ('loaded', save text) in order
+        self.recorded_loads = None # deque of save texts from a log while replay.py replays it
+        self.player = Player()
+        self.triggers = QuestTracker(STORY)  # Quest and ending triggers waiting to be checked
+        self.player.on_change = self.item_changed
+        self.rooms = {}
+        self.current_room_name = None
+        self.previous_room_name = None
+        self.running = True
+        self.player_choice = None  # Track player's significant choice
+        self.ending = None         # 'victory', 'bad_ending', 'secret_ending' or 'death'
+        self.gui = None
+        self.commands = COMMANDS   # Shared verb table; see build_command_table
+        self.quests = {
+            'main_quest': {
+                'active': False,
+                'completed': False,
+                'description': 'Defeat the dragon and retrieve the golden apple.',
+                'reward': None,
+            },
+            'stranger_quest': {
+                'active': False,
+                'completed': False,
+                'description': 'Help the Mysterious Stranger by retrieving the cursed amulet.',
+                'reward': None,
+            },
+        }
+        self.stats = None          # instrument.Stats while instrumentation is on
+        self.autosaver = None      # autosave.AutoSaver when saves go through a background thread
+        self.batching = False      # True while run_batch is playing a list of commands
+        # States to go back to with 'undo' and 'rewind'. A snapshot is taken
+        # after every command, so only games played by a person ask for one;
+        # a shared world cannot be rewound
+        self.history = History() if history and shared is None else None
+        self.save_dir = saveslots.SAVE_DIR
+        self.play_time = 0.0       # Seconds played before session_started (restored by loading)
+        self.session_started = time.monotonic()
+        if os.environ.get('ADVENTURE_STATS'):
+            instrument.enable(self)
+
+    # Rooms are tracked by name so that a room copied into the overlay is
+    # picked up automatically
+    @property
+    def current_room(self):
+        return self.rooms[self.current_room_name] if self.current_room_name else None
+
+    @current_room.setter
+    def current_room(self, room):
+        self.current_room_name = room.name if room else None
+        if room:
+            self.rooms.visit(room.name)
+        self.triggers.changed(('room',))
+
+    @property
+    def previous_room(self):
+        return self.rooms[self.previous_room_name] if self.previous_room_name else None
+
+    @previous_room.setter
+    def previous_room(self, room):
+        self.previous_room_name = room.name if room else None
+
+    def setup(self):
+        # Initialize rooms, items, and enemies
+        self.create_world()
+        self.triggers.changed_all()
+        if self.history is not None:
+            self.history.take(self)
+
+    # Tell the quest triggers what changed
+    def item_changed(self, item_name):
+        self.triggers.changed(('item', item_name))
+
+    def quest_changed(self, quest):
+        self.triggers.changed(('quest', quest))
+
+    def set_player_choice(self, choice):
+        self.player_choice = choice
+        self.triggers.changed(('flag', 'player_choice'))
+
+    def world_template(self):
+        if self.shared is not None:
+            return self.shared.template
+        return load_world(self.world) if self.world else default_world()
+
+    def create_world(self, rooms=None):
+        # Rooms come from the shared template; changes go to this game's overlay,
+        # or straight into the shared world. Loading a save passes in the
+        # overlay it has already built (see savefile.apply_state)
+        template = self.world_template()
+        if self.shared is not None:
+            self.rooms = self.shared
+        else:
+            self.rooms = rooms if rooms is not None else World(template)
+        self.router = Router(self.rooms)
+
+        # Set current room
+        self.current_room = self.rooms[template.start]
+
+        # Quest reward
+        self.quests['main_quest']['reward'] = template.quest_reward
+
+        # Create the Mysterious Stranger NPC
+        self.mysterious_stranger = {
+            'name': 'Mysterious Stranger',
+            'description': 'A cloaked figure with an unknown agenda.',
+            'location': template.stranger_location,
+        }
+
+    def create_item(self, name):
+        return make_item(name)
+
+    def create_enemy(self, name, health=None):
+        return make_enemy(name, health)
+
+    def play(self, gui):
+        self.gui = gui
+        self.setup()
+        self.display_location()
+        # Removed automatic instructions display
+
+    def played(self):
+        # Total seconds played in this game, across saves and loads
+        return self.play_time + time.monotonic() - self.session_started
+
+    def save_game(self, slot=saveslots.DEFAULT_SLOT):
+        # Returns None once the slot is written, or a message saying why it was not
+        if self.autosaver:
+            # The file is written on the autosaver's thread; the player asked
+            # for this save, so wait for it and say if it failed
+            self.autosaver.save(self, slot)
+            error = self.autosaver.wait(self.save_dir, slot, SAVE_TIMEOUT)
+        else:
+            try:
+                saveslots.save(self, slot, self.save_dir)
+                error = None
+            except OSError as e:
+                error = e
+        if error is not None:
+            return f"The game could not be saved to '{slot}': {getattr(error, 'strerror', None) or error}"
+        print("Game saved successfully.")
+        return None
+
+    def report_failed_saves(self):
+        # Autosaves that failed since the player last saved, loaded or listed the saves
+        if not self.autosaver:
+            return
+        self.autosaver.flush(SAVE_TIMEOUT)
+        for slot, error in self.autosaver.take_errors(self.save_dir):
+            self.gui.display_message(f"Saving to '{slot}' failed: {getattr(error, 'strerror', None) or error}", 'system')
+
+    def load_game(self, slot=saveslots.DEFAULT_SLOT):
+        # Returns None once the slot is loaded, or a message saying why it was not
+        if self.autosaver:
+            self.autosaver.flush()  # A save still being written would otherwise be missed
+        try:
+            savefile.loads(self, self.read_save(slot))
+            print("Game loaded successfully.")
+            return None
+        except FileNotFoundError:
+            print("No saved game found.")
+            return f"There is no saved game '{slot}'. Type 'saves' to list them."
+        except savefile.SaveFormatError as e:
+            return f"The saved game '{slot}' could not be loaded: {e}"
+        except OSError as e:
+            return f"The saved game '{slot}' could not be read: {e.strerror or e}"
+
+    def read_save(self, slot):
+        # Every load is logged with the text it read (None if there was
+        # nothing to read), so a replay loads exactly what this game loaded
+        # without looking at the save folder, which may have changed since
+        if self.recorded_loads:
+            data = self.recorded_loads.popleft()
+        else:
+            try:
+                data = saveslots.read(slot, self.save_dir)
+            except OSError:
+                self.log.append(('loaded', None))
+                raise
+        self.log.append(('loaded', data))
+        if data is None:
+            raise FileNotFoundError(f"no saved game in slot {slot!r}")
+        return data
+
+    def check_victory_condition(self, gui):
+        # Endings and quest steps are triggers in quests.py; only the ones
+        # reading state that changed since the last check are tested
+        self.triggers.run(self)
+
+    def check_quest_completion(self, gui):
+        if self.quests['main_quest']['active'] and self.player.has_item('lost crown'):
+            self.quests['main_quest']['active'] = False
+            self.quests['main_quest']['completed'] = True
+            self.quest_changed('main_quest')
+            self.player.add_item(self.quests['main_quest']['reward'])
+            gui.display_message("You have completed the quest and received the ring of power!", 'system')
+            self.player.remove_item('lost crown')
+
+    def solve_riddle(self, room, gui):
+        gui.display_message("A voice echoes: 'I speak without a mouth and hear without ears. I have nobody, but I come alive with the wind. What am I?'", 'system')
+        answer = self.ask("Your answer: ").strip().lower()
+        if answer == 'echo':
+            gui.display_message("The door creaks open as you answer correctly.", 'system')
+            with self.rooms.lock(room.name):
+                room = self.rooms.edit(room.name)
+                room.locked = False
+            self.router.changed(room.name)
+            self.previous_room = self.current_room
+            self.current_room = room
+            self.display_location()
+        else:
+            gui.display_message("The voice says, 'Incorrect. You may not enter.'", 'system')
+
+    def create_random_enemy(self):
+        return self.create_enemy(self.rng.choice(RANDOM_ENEMIES))
+
+    def create_random_treasure(self):
+        return self.create_item(self.rng.choice(RANDOM_TREASURES))
+
+    def display_location(self):
+        # Other games sharing the world may be changing this room
+        with self.rooms.lock(self.current_room_name):
+            room = self.current_room
+            view = room.view or self.room_view(room)
+        for message, msg_type in view:
+            self.gui.display_message(message, msg_type)
+
+        # Check for NPC in the room; the stranger belongs to this game, not the room
+        if self.mysterious_stranger['location'] == room.name:
+            self.gui.display_message(f"You see {self.mysterious_stranger['name']} here.", 'npc')
+
+    def room_view(self, room):
+        # Render a room as (message, msg_type) pairs and keep the result on the
+        # room, so showing it again costs nothing until World.edit drops it
+        lines = ['\n------------------------------', f"You are in the {room.name}.", room.description]
+
+        # Show available items; crowded rooms only list the first few kinds
+        if room.items:
+            lines.append("You see the following items:")
+            shown = 0
+            for item, count in room.items.grouped(ROOM_LISTING_LIMIT):
+                lines.append(self.describe_stack(item, count))
+                shown += count
+            if room.items.kinds() > ROOM_LISTING_LIMIT:
+                hidden = len(room.items) - shown
+                lines.append(f"...and {hidden} more items. Type 'items' to see them all.")
+
+        # Show available exits
+        lines.append(f"Exits: {', '.join(room.exits.keys())}")
+        view = [('\n'.join(lines), 'system')]
+
+        # Check for enemy in the room
+        if room.enemy:
+            view.append((f"A {room.enemy.name} is here! {room.enemy.description}", 'enemy'))
+        room.view = view = tuple(view)
+        return view
+
+    def describe_stack(self, item, count):
+        if count > 1:
+            return f"- {item.name} x{count}: {item.description}"
+        return f"- {item.name}: {item.description}"
+
+    def list_room_items(self):
+        with self.rooms.lock(self.current_room_name):
+            stacks = self.current_room.items.grouped()
+        if not stacks:
+            self.gui.display_message("There is nothing here.", 'system')
+            return
+        # One message for the whole list, however many items are lying here
+        lines = [self.describe_stack(item, count) for item, count in stacks]
+        self.gui.display_message('\n'.join(["Items here:"] + lines), 'system')
+
+    def display_instructions(self):
+        instructions = "\nYou can:\n- Move: 'north', 'south', 'east', 'west', 'up', 'down'\n" \
+                       "- Travel: 'go to [room]' walks the shortest known way to a room\n" \
+                       "- Interact: 'get [item]', 'drop [item]', 'use [item]'\n" \
+                       "- Other actions: 'search', 'look', 'items', 'inventory', 'save [slot]', 'load [slot]', 'saves', 'undo', 'rewind [steps]', 'accept quest', 'complete quest', 'talk', 'stats'\n" \
+                       "- Shortcuts: 'n', 's', 'e', 'w', 'u', 'd', 'l' (look), 'i' (inventory), 'take [item]',\n" \
+                       "  or the start of any command, e.g. 'inv' or 'acc'\n" \
+                       "- Several at once: separate commands with ';', e.g. 'north; get key; south'\n" \
+                       "- Quit: Press 'Esc' key or type 'quit'\n"
+        self.gui.display_message(instructions, 'system')
+
+    def display_help(self):
+        help_message = "\nYour goal is to kill the dragon, take the golden apple, and go to the tower to win the game.\n" \
+                       "You may encounter characters who offer additional quests that can change the outcome of the game.\n" \
+                       "Prepare yourself by finding weapons and health potions.\n" \
+                       "Explore rooms, defeat enemies, and make choices wisely."
+        self.gui.display_message(help_message, 'system')
+
+    def ask(self, prompt):
+        # All prompts go through here so the answers end up in the log
+        answer = self.gui.get_player_input(prompt)
+        self.log.append(('answer', answer))
+        return answer
+
+    def handle_command(self, action):
+        if not self.running or not self.player.is_alive():
+            return
+        self.log.append(('command', action))
+
+        command, argument = self.commands.parse(action)
+        if command is None:
+            self.gui.display_message("Invalid action. Type 'instructions' to see available commands.", 'system')
+        elif command.argument and not argument and not command.optional:
+            self.gui.display_message(f"{command.verb.capitalize()} what?", 'system')
+        else:
+            command.run(self, argument)
+            if not command.end_turn:
+                return
+
+        # Handle enemy in the room
+        if self.current_room.enemy:
+            with self.rooms.lock(self.current_room_name):
+                enemy = self.rooms.edit(self.current_room_name).enemy
+            if enemy:  # Someone sharing the world may have just defeated it
+                self.combat(enemy)
+                if not self.player.is_alive():
+                    return
+
+        # Check quests and endings affected by this command
+        self.check_victory_condition(self.gui)
+
+        if self.history is not None:
+            self.history.take(self)
+        if self.autosaver and not self.batching:
+            self.autosaver.after_command(self)
+
+    def run_batch(self, commands, echo=None):
+        # Play several commands in a row ('north; get key; south' or a script
+        # file, see commands.py). Each one runs, is logged and can be undone
+        # exactly as if it had been typed on its own, fights and endings
+        # included; the batch stops when the game ends. Only the autosave is
+        # left until after the last command. echo(command) is called before
+        # each command, for front ends that show what was typed
+        self.batching = True
+        try:
+            for command in commands:
+                if not self.running or not self.player.is_alive():
+                    break
+                if echo:
+                    echo(command)
+                self.handle_command(command)
+        finally:
+            self.batching = False
+        if self.autosaver and self.player.is_alive():
+            self.autosaver.after_command(self)
+
+    def quit_game(self):
+        self.gui.quit_game()
+
+    def search_room(self):
+        with self.rooms.lock(self.current_room_name):
+            self.rooms.edit(self.current_room_name).search()
+        self.router.changed(self.current_room_name)
+        self.gui.display_message("You search the area and discover something!", 'system')
+        self.display_location()
+
+    def save_command(self, slot):
+        if self.shared is not None:
+            self.gui.display_message("Saving is not available in a shared world.", 'system')
+            return
+        slot = slot or saveslots.DEFAULT_SLOT
+        if not saveslots.valid_slot(slot):
+            self.gui.display_message("Slot names are up to 32 letters, digits, '-' or '_'.", 'system')
+            return
+        self.report_failed_saves()
+        problem = self.save_game(slot)
+        self.gui.display_message(problem or f"Game saved to '{slot}'.", 'system')
+
+    def load_command(self, slot):
+        if self.shared is not None:
+            self.gui.display_message("Loading is not available in a shared world.", 'system')
+            return
+        self.report_failed_saves()
+        slot = slot or saveslots.DEFAULT_SLOT
+        if not saveslots.valid_slot(slot):
+            problem = f"There is no saved game '{slot}'. Type 'saves' to list them."
+        else:
+            problem = self.load_game(slot)
+        if problem:
+            self.gui.display_message(problem, 'system')
+            return
+        self.display_location()
+
+    def undo(self):
+        self.rewind('1')
+
+    def rewind(self, steps):
+        if self.history is None:
+            if self.shared is not None:
+                self.gui.display_message("Time cannot be rewound in a shared world.", 'system')
+            else:
+                self.gui.display_message("Undo is turned off in this game.", 'system')
+            return
+        if not steps.isdigit() or int(steps) < 1:
+            self.gui.display_message("Rewind how many steps? For example, 'rewind 3'.", 'system')
+            return
+        undone = self.history.rewind(self, int(steps))
+        if not undone:
+            self.gui.display_message("There is nothing to undo.", 'system')
+            return
+        self.gui.display_message(f"You rewind time by {undone} {'step' if undone == 1 else 'steps'}.", 'system')
+        self.display_location()
+
+    def list_saves(self):
+        if self.shared is not None:
+            self.gui.display_message("Saved games are not available in a shared world.", 'system')
+            return
+        self.report_failed_saves()
+        try:
+            slots = saveslots.list_slots(self.save_dir)
+        except OSError as e:
+            self.gui.display_message(f"The saved games could not be listed: {e.strerror or e}", 'system')
+            return
+        if not slots:
+            self.gui.display_message("There are no saved games.", 'system')
+            return
+        lines = ["Saved games:"] + [saveslots.describe(slot, info) for slot, info in slots]
+        self.gui.display_message('\n'.join(lines), 'system')
+
+    def complete_quest(self):
+        self.check_quest_completion(self.gui)
+
+    def move_player(self, direction):
+        room = self.current_room
+        if direction in room.exits:
+            next_room = self.rooms[room.exits[direction]]
+            if next_room.locked:
+                if next_room.name == 'Mystic Chamber':
+                    self.solve_riddle(next_room, self.gui)
+                elif self.player.has_item('key'):
+                    self.gui.display_message("You use the key to unlock the door.", 'system')
+                    with self.rooms.lock(next_room.name):
+                        next_room = self.rooms.edit(next_room.name)
+                        next_room.locked = False
+                    self.router.changed(next_room.name)
+                    self.previous_room = self.current_room
+                    self.current_room = next_room
+                    self.display_location()
+                else:
+                    self.gui.display_message("The door is locked. You need a key.", 'system')
+            else:
+                self.previous_room = self.current_room
+                self.current_room = next_room
+                self.display_location()
+        else:
+            self.gui.display_message("You can't go that way.", 'system')
+
+    def go_to(self, destination):
+        if destination.startswith('to '):
+            destination = destination[3:]
+        target = self.router.find(destination)
+        if target is None:
+            self.gui.display_message(f"You don't know of any place called '{destination}'.", 'system')
+            return
+        if target == self.current_room_name:
+            self.gui.display_message(f"You are already in the {target}.", 'system')
+            return
+        path = self.router.route(self.current_room_name, target)
+        if path is None:
+            self.gui.display_message(f"You don't know a way to the {target} from here.", 'system')
+            return
+        for direction in path:
+            before = self.current_room_name
+            self.move_player(direction)
+            # Stop at a door that stayed shut, a fight, or an ending on the way
+            if self.current_room_name == before or self.current_room.enemy:
+                return
+            self.check_victory_condition(self.gui)
+            if not self.running:
+                return
+
+    def get_item(self, item_name):
+        # Under the room's lock, so two players sharing the world cannot both take the last one
+        with self.rooms.lock(self.current_room_name):
+            room = self.current_room
+            item = room.items.get(item_name)
+            if item is None:
+                self.gui.display_message("That item is not here.", 'system')
+                return
+            taken = self.player.add_item(item)
+            if taken:
+                self.rooms.edit(room.name).items.remove(item_name)
+        if taken:
+            self.gui.display_message(f"You have picked up the {item.name}.", 'system')
+            if item.effect:
+                item.use(self.player, self.gui)
+        else:
+            self.gui.display_message("You can't carry any more weight. Consider dropping something.", 'system')
+
+    def drop_item(self, item_name):
+        item = self.player.remove_item(item_name)
+        if item:
+            with self.rooms.lock(self.current_room_name):
+                self.rooms.edit(self.current_room_name).items.add(item)
+            self.gui.display_message(f"You have dropped the {item.name}.", 'system')
+            if item.name == 'mysterious amulet':
+                self.player.attack -= 10
+                self.gui.display_message("You feel your power wane. Your attack decreases by 10.", 'system')
+        else:
+            self.gui.display_message("You don't have that item.", 'system')
+
+    def use_item(self, item_name):
+        item = self.player.inventory.get(item_name)
+        if item:
+            item.use(self.player, self.gui)
+            if item.name == 'health potion':
+                self.player.remove_item(item.name)
+            return
+        self.gui.display_message("You don't have that item.", 'system')
+
+    def show_inventory(self):
+        self.gui.display_message(f"Your health: {self.player.health}", 'system')
+        if self.player.inventory:
+            self.gui.display_message("You are carrying:", 'system')
+            total_weight = self.player.calculate_carry_weight()
+            for item, count in self.player.inventory.grouped():
+                if count > 1:
+                    self.gui.display_message(f"- {item.name} x{count} (Weight: {item.weight} each)", 'system')
+                else:
+                    self.gui.display_message(f"- {item.name} (Weight: {item.weight})", 'system')
+            self.gui.display_message(f"Total carry weight: {total_weight}/{self.player.max_weight}", 'system')
+        else:
+            self.gui.display_message("Your inventory is empty.", 'system')
+
+    def show_stats(self):
+        if self.stats is None:
+            self.gui.display_message("Statistics are off. Start the game with ADVENTURE_STATS=1 to collect them.", 'system')
+            return
+        for line in self.stats.report():
+            self.gui.display_message(line, 'system')
+
+    def dump_stats(self):
+        if self.stats is None:
+            self.gui.display_message("Statistics are off. Start the game with ADVENTURE_STATS=1 to collect them.", 'system')
+            return
+        self.stats.dump(instrument.STATS_FILE)
+        self.gui.display_message(f"Statistics written to {instrument.STATS_FILE}.", 'system')
+
+    def combat(self, enemy):
+        self.gui.display_message(f"A wild {enemy.name} appears!", 'enemy')
+        while enemy.is_alive() and self.player.is_alive():
+            action = self.ask("Do you want to 'attack' or 'run'? ").strip().lower()
+            if action == 'attack':
+                # Player attacks enemy; in a shared world others may be fighting it too
+                with self.rooms.lock(self.current_room_name):
+                    enemy.health -= self.player.attack
+                    if not enemy.is_alive():
+                        room = self.rooms.edit(self.current_room_name)
+                        if room.enemy is enemy:
+                            room.enemy = None
+                self.gui.display_message(f"You attack the {enemy.name} for {self.player.attack} damage.", 'player')
+                # Enemy attacks back if still alive
+                if enemy.is_alive():
+                    self.player.health -= enemy.attack
+                    self.gui.display_message(f"The {enemy.name} attacks you for {enemy.attack} damage.", 'enemy')
+                    self.gui.display_message(f"Your health is now {self.player.health}.", 'system')
+                else:
+                    self.gui.display_message(f"You have defeated the {enemy.name}!", 'system')
+            elif action == 'run':
+                self.gui.display_message("You run back to the previous room.", 'system')
+                self.current_room = self.previous_room if self.previous_room else self.current_room
+                self.display_location()
+                break
+            else:
+                self.gui.display_message("Invalid action. Type 'attack' or 'run'.", 'system')
+        if not self.player.is_alive():
+            self.ending = 'death'
+            self.game_over()
+
+    def accept_quest(self):
+        if not self.quests['main_quest']['active'] and not self.quests['main_quest']['completed']:
+            self.quests['main_quest']['active'] = True
+            self.quest_changed('main_quest')
+            self.gui.display_message(f"You have accepted the quest: {self.quests['main_quest']['description']}", 'system')
+        else:
+            self.gui.display_message("You have already accepted or completed the quest.", 'system')
+
+    def interact_with_stranger(self):
+        if self.current_room_name == self.mysterious_stranger['location']:
+            self.gui.display_message("The Mysterious Stranger approaches you.", 'npc')
+            choice = self.ask("Do you want to help the stranger? (yes/no) ").strip().lower()
+            if choice == 'yes':
+                self.quests['stranger_quest']['active'] = True
+                self.quest_changed('stranger_quest')
+                self.gui.display_message("You agreed to help the Mysterious Stranger.", 'npc')
+            else:
+                self.gui.display_message("You declined the stranger's request.", 'npc')
+                self.set_player_choice('declined_stranger')
+        else:
+            self.gui.display_message("There's no one here to interact with.", 'system')
+
+    def secret_ending(self):
+        self.gui.display_message("You follow the hidden path revealed by the Mysterious Stranger.", 'system')
+        self.gui.display_message("You discover a secret realm and become its ruler!", 'system')
+        self.ending = 'secret_ending'
+        self.game_over()
+
+    def bad_ending(self):
+        self.gui.display_message("By declining the Mysterious Stranger, you unknowingly invoked a curse.", 'system')
+        self.gui.display_message("Darkness consumes the land, and you fade into obscurity.", 'system')
+        self.ending = 'bad_ending'
+        self.game_over()
+
+    def game_over(self):
+        self.gui.display_message("Game Over.", 'system')
+        self.running = False
+        self.gui.game_over()
+
+def build_command_table():
+    table = CommandTable()
+    for direction, alias in [('north', 'n'), ('south', 's'), ('east', 'e'),
+                             ('west', 'w'), ('up', 'u'), ('down', 'd')]:
+        table.register(direction, lambda game, direction=direction: game.move_player(direction), aliases=[alias])
+    table.register('quit', Game.quit_game, aliases=['exit', 'q'], prefix=False, end_turn=False)
+    table.register('go', Game.go_to, argument=True, prefix=False)
+    # Handlers called through the instance, so instrument.enable can time them
+    table.register('search', lambda game: game.search_room())
+    table.register('look', lambda game: game.display_location(), aliases=['l'])
+    table.register('get', lambda game, item: game.get_item(item), aliases=['take'], argument=True)
+    table.register('drop', lambda game, item: game.drop_item(item), argument=True)
+    table.register('use', lambda game, item: game.use_item(item), argument=True)
+    table.register('inventory', lambda game: game.show_inventory(), aliases=['i', 'inv'])
+    table.register('items', Game.list_room_items)
+    table.register('save', Game.save_command, argument=True, optional=True)
+    table.register('load', Game.load_command, argument=True, optional=True, prefix=False)
+    table.register('saves', Game.list_saves, end_turn=False)
+    table.register('undo', Game.undo, end_turn=False)
+    table.register('rewind', Game.rewind, argument=True, end_turn=False)
+    table.register('accept quest', Game.accept_quest)
+    table.register('complete quest', Game.complete_quest)
+    table.register('instructions', Game.display_instructions)
+    table.register('help', Game.display_help)
+    table.register('talk', Game.interact_with_stranger)
+    table.register('stats', Game.show_stats, end_turn=False)
+    table.register('stats dump', Game.dump_stats, end_turn=False)
+    return table
+
+# Commands understood by every Game; content can add more with COMMANDS.register
+COMMANDS = build_command_table()
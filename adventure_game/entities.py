@@ -0,0 +1,225 @@
+# entities.py
+#
+# The things a world is made of: items, enemies, rooms and the player.
+# Worlds can hold a very large number of these, so every class uses
+# __slots__. Items never change and are shared, one per name (see
+# world.make_item). Enemies share an EnemyType with their fixed stats and
+# only keep their own health.
+
+from itertools import islice
+
+# Define the Item class
+class Item:
+    __slots__ = ('name', 'description', 'weight', 'effect')
+
+    def __init__(self, name, description, weight=0, effect=None):
+        self.name = name
+        self.description = description
+        self.weight = weight
+        self.effect = effect  # Function that defines what the item does
+
+    def use(self, player, gui):
+        if self.effect:
+            self.effect(player, gui)
+
+# Define the EnemyType class
+class EnemyType:
+    # The stats every enemy of one kind shares; one per kind (see world.enemy_type)
+    __slots__ = ('name', 'health', 'attack', 'description')
+
+    def __init__(self, name, health, attack, description):
+        self.name = name
+        self.health = health  # Starting health
+        self.attack = attack
+        self.description = description
+
+# Define the Enemy class
+class Enemy:
+    __slots__ = ('kind', 'health')
+
+    def __init__(self, kind, health=None):
+        self.kind = kind
+        self.health = kind.health if health is None else health
+
+    @property
+    def name(self):
+        return self.kind.name
+
+    @property
+    def attack(self):
+        return self.kind.attack
+
+    @property
+    def description(self):
+        return self.kind.description
+
+    def is_alive(self):
+        return self.health > 0
+
+    def copy(self):
+        return Enemy(self.kind, self.health)
+
+# Define the Room class
+class Room:
+    __slots__ = ('name', 'description', 'exits', 'items', 'enemy', 'locked', 'hidden_exits', 'view')
+
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self.exits = {}        # Dictionary of exits: {'north': room name}
+        self.items = ItemBag() # Items lying in the room, indexed by name
+        self.enemy = None      # Enemy object
+        self.locked = False
+        self.hidden_exits = {} # For hidden paths
+        self.view = None       # Rendered description, see Game.room_view; dropped by World.edit
+
+    def add_exit(self, direction, room, locked=False):
+        self.exits[direction] = room.name
+        if locked:
+            room.locked = True
+
+    def add_hidden_exit(self, direction, room):
+        self.hidden_exits[direction] = room.name
+
+    def search(self):
+        # New dicts instead of changes in place: in a shared world other
+        # games may be searching routes through these exits right now
+        self.exits = {**self.exits, **self.hidden_exits}
+        self.hidden_exits = {}
+
+    def copy(self):
+        # Items are never changed in place, so the copy can share them. Skips
+        # __init__: rooms are copied on every edit and every undo snapshot
+        room = Room.__new__(Room)
+        room.name = self.name
+        room.description = self.description
+        room.exits = dict(self.exits)
+        room.items = self.items.copy()
+        room.enemy = self.enemy.copy() if self.enemy else None
+        room.locked = self.locked
+        room.hidden_exits = dict(self.hidden_exits)
+        room.view = None
+        return room
+
+# Define the ItemBag class
+class ItemBag:
+    # Items indexed by name. Items with the same name stack, and the total
+    # weight is kept up to date, so lookups, removal and weight are O(1).
+    __slots__ = ('stacks', 'weight', 'size', 'frozen')
+
+    def __init__(self, items=()):
+        self.stacks = {}  # {name: [Item, count]}, in the order names were first added
+        self.weight = 0
+        self.size = 0
+        self.frozen = False
+        for item in items:
+            self.add(item)
+
+    def freeze(self):
+        # Used for bags shared between sessions; copy() gives a writable bag
+        self.frozen = True
+        return self
+
+    def add(self, item, count=1):
+        if self.frozen:
+            raise TypeError("cannot add to a frozen ItemBag")
+        stack = self.stacks.get(item.name)
+        if stack is None:
+            self.stacks[item.name] = [item, count]
+        else:
+            stack[1] += count
+        self.weight += item.weight * count
+        self.size += count
+
+    def remove(self, name):
+        # Take one item with this name out of the bag; None if there is none
+        if self.frozen:
+            raise TypeError("cannot remove from a frozen ItemBag")
+        stack = self.stacks.get(name)
+        if stack is None:
+            return None
+        item = stack[0]
+        stack[1] -= 1
+        if stack[1] == 0:
+            del self.stacks[name]
+        self.weight -= item.weight
+        self.size -= 1
+        return item
+
+    def get(self, name):
+        stack = self.stacks.get(name)
+        return stack[0] if stack else None
+
+    def count(self, name):
+        stack = self.stacks.get(name)
+        return stack[1] if stack else 0
+
+    def grouped(self, limit=None):
+        # (item, count) pairs, one per name; only the first `limit` if given
+        return [(item, count) for item, count in islice(self.stacks.values(), limit)]
+
+    def kinds(self):
+        return len(self.stacks)
+
+    def names(self):
+        return [item.name for item in self]
+
+    def copy(self):
+        bag = ItemBag.__new__(ItemBag)
+        bag.stacks = {name: [item, count] for name, (item, count) in self.stacks.items()}
+        bag.weight = self.weight
+        bag.size = self.size
+        bag.frozen = False
+        return bag
+
+    def __contains__(self, name):
+        return name in self.stacks
+
+    def __iter__(self):
+        for item, count in self.stacks.values():
+            for _ in range(count):
+                yield item
+
+    def __len__(self):
+        return self.size
+
+# Define the Player class
+class Player:
+    __slots__ = ('health', 'attack', 'inventory', 'max_weight', 'on_change')
+
+    def __init__(self):
+        self.health = 100
+        self.attack = 15
+        self.inventory = ItemBag()
+        self.max_weight = 20
+        self.on_change = None  # Optional function(item_name) called when the inventory changes
+
+    def calculate_carry_weight(self):
+        return self.inventory.weight
+
+    def add_item(self, item):
+        if self.inventory.weight + item.weight <= self.max_weight:
+            if self.inventory.frozen:
+                self.inventory = self.inventory.copy()  # Frozen by an undo snapshot that shares it
+            self.inventory.add(item)
+            if self.on_change:
+                self.on_change(item.name)
+            return True
+        else:
+            return False
+
+    def remove_item(self, item_name):
+        if self.inventory.frozen:
+            if item_name not in self.inventory:
+                return None
+            self.inventory = self.inventory.copy()
+        item = self.inventory.remove(item_name)
+        if item and self.on_change:
+            self.on_change(item_name)
+        return item
+
+    def has_item(self, item_name):
+        return item_name in self.inventory
+
+    def is_alive(self):
+        return self.health > 0
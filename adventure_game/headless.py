@@ -0,0 +1,62 @@
+# headless.py
+#
+# In-memory GameInterface for running the engine without a window. Output is
+# collected in a list and prompt answers come from a queue (or a callback), so
+# many sessions can run in one process without importing tkinter or PIL.
+
+from collections import deque
+
+from engine import Game, GameInterface
+
+# Define the HeadlessGUI class
+class HeadlessGUI(GameInterface):
+    def __init__(self, answers=(), on_prompt=None):
+        self.output = []              # List of (message, msg_type) tuples
+        self.answers = deque(answers) # Queued answers for get_player_input
+        self.on_prompt = on_prompt    # Optional function(prompt) -> answer
+        self.finished = False
+        self.game = None
+
+    def display_message(self, message, msg_type='system'):
+        self.output.append((message, msg_type))
+
+    def get_player_input(self, prompt=""):
+        if self.answers:
+            return self.answers.popleft()
+        if self.on_prompt:
+            return self.on_prompt(prompt) or ''
+        # Same behaviour as input() when there is nothing left to read
+        raise EOFError(f"No answer available for prompt: {prompt!r}")
+
+    def game_over(self):
+        self.finished = True
+
+    def quit_game(self):
+        self.game.running = False
+        self.finished = True
+
+    def answer(self, *answers):
+        self.answers.extend(answers)
+
+    def take_output(self):
+        output = self.output
+        self.output = []
+        return output
+
+    def transcript(self):
+        return '\n'.join(message for message, msg_type in self.output)
+
+# Start a new headless session and return (game, gui); history=True keeps
+# the undo history the window has
+def new_session(answers=(), on_prompt=None, seed=None, history=False):
+    gui = HeadlessGUI(answers, on_prompt)
+    game = Game(seed=seed, history=history)
+    gui.game = game
+    game.play(gui)
+    return game, gui
+
+# Run a list of commands against a fresh session and return (game, gui)
+def run_commands(commands, answers=(), seed=None, history=False):
+    game, gui = new_session(answers, seed=seed, history=history)
+    game.run_batch(commands, echo=lambda command: gui.display_message(f"\n> {command}", 'input'))
+    return game, gui
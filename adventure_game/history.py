@@ -0,0 +1,141 @@
+# history.py
+#
+# In-memory undo. After every command the game's state is recorded as a
+# Snapshot, and 'undo' or 'rewind N' put an earlier one back without
+# touching the disk. Consecutive snapshots share everything that did not
+# change between them, and they share rooms and the inventory with the game
+# itself, copy-on-write: a snapshot keeps the game's own Room objects and
+# ItemBag, World.edit copies a room before its first change after a
+# snapshot, and Player copies the (frozen) inventory before changing it.
+# Neither taking nor restoring a snapshot copies anything, and a step that
+# only moved the player costs a couple of hundred bytes.
+#
+# The RNG and the command log are not rewound. 'undo' is logged like any
+# other command, so a replay repeats it, and a fight fought again after an
+# undo rolls new dice.
+
+from collections import deque
+
+from routing import Router
+from world import World
+
+HISTORY_LIMIT = 500  # Snapshots kept; the oldest are dropped first
+
+# Define the Snapshot class
+class Snapshot:
+    __slots__ = ('world', 'rooms', 'inventory', 'quests', 'values')
+
+    def __init__(self, world, rooms, inventory, quests, values):
+        self.world = world          # The World these rooms came from (loading a save makes a new one)
+        self.rooms = rooms          # {name: Room} for every room in the session overlay; never changed
+        self.inventory = inventory  # Frozen ItemBag, shared with the player until it changes
+        self.quests = quests        # [(active, completed), ...] in game.quests order
+        self.values = values        # See game_values
+
+def same_room(room, old):
+    # True if an edited room still matches the snapshot's room
+    if old is None or room.locked != old.locked or room.items.stacks != old.items.stacks:
+        return False
+    if room.exits != old.exits or room.hidden_exits != old.hidden_exits:
+        return False
+    if room.enemy is None or old.enemy is None:
+        return room.enemy is old.enemy
+    return room.enemy.kind is old.enemy.kind and room.enemy.health == old.enemy.health
+
+def game_values(game):
+    player = game.player
+    return (game.current_room_name, game.previous_room_name, player.health, player.attack,
+            player.max_weight, game.player_choice, game.mysterious_stranger['location'],
+            game.running, game.ending)
+
+# Define the History class
+class History:
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.snapshots = deque(maxlen=limit)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def take(self, game):
+        # Record the game's state unless it is the same as the last snapshot
+        last = self.snapshots[-1] if self.snapshots else None
+        world = game.rooms
+        if last is None or last.world is not world:
+            rooms = dict(world.changed)
+            world.edited = set()  # Every room is now shared with the snapshot
+        else:
+            rooms = last.rooms
+            if world.edited:
+                # Rooms can be edited without changing (a locked door tried without the key)
+                edited = [name for name in world.edited if not same_room(world.changed[name], rooms.get(name))]
+                world.edited = set()
+                if edited:
+                    rooms = dict(rooms)
+                    for name in edited:
+                        rooms[name] = world.changed[name]
+
+        inventory = game.player.inventory
+        if last is not None and inventory is not last.inventory and inventory.stacks == last.inventory.stacks:
+            inventory = game.player.inventory = last.inventory  # Taken and put back
+        inventory.freeze()
+        quests = [(quest['active'], quest['completed']) for quest in game.quests.values()]
+        values = game_values(game)
+        if last is not None:
+            if rooms is last.rooms and inventory is last.inventory and quests == last.quests and values == last.values:
+                return last
+            if quests == last.quests:
+                quests = last.quests
+        snapshot = Snapshot(world, rooms, inventory, quests, values)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def rewind(self, game, steps=1):
+        # Go back `steps` recorded states; returns how many were undone
+        steps = min(steps, len(self.snapshots) - 1)
+        if steps <= 0:
+            return 0
+        for _ in range(steps):
+            self.snapshots.pop()
+        restore(game, self.snapshots[-1])
+        self.rebase(game)
+        return steps
+
+    def rebase(self, game):
+        # The game holds the last snapshot's state, possibly in a new World
+        # (after a restore, or a replay loading a save); compare later states
+        # with that World so the same state is not recorded twice
+        last = self.snapshots[-1]
+        if last.world is not game.rooms:
+            self.snapshots[-1] = Snapshot(game.rooms, last.rooms, last.inventory, last.quests, last.values)
+        game.rooms.edited = set()
+
+def restore(game, snapshot):
+    world = game.rooms
+    if world is snapshot.world:
+        # Routes through rooms that are about to change are stale
+        for name in world.changed.keys() | snapshot.rooms.keys():
+            game.router.changed(name)
+    else:
+        # A save was loaded since; start from a fresh overlay on the snapshot's template
+        world = game.rooms = World(snapshot.world.template)
+        game.router = Router(world)
+    world.changed = dict(snapshot.rooms)  # Shared: the next edit of each room copies it
+    world.edited = set()
+
+    (current, previous, health, attack, max_weight,
+     choice, stranger, running, ending) = snapshot.values
+    game.player.health = health
+    game.player.attack = attack
+    game.player.max_weight = max_weight
+    game.player.inventory = snapshot.inventory
+    for quest, (active, completed) in zip(game.quests.values(), snapshot.quests):
+        quest['active'] = active
+        quest['completed'] = completed
+    game.current_room = world[current]
+    game.previous_room_name = previous
+    game.player_choice = choice
+    game.mysterious_stranger['location'] = stranger
+    game.running = running
+    game.ending = ending
+    # Anything may have changed, so every trigger gets checked again
+    game.triggers.changed_all()
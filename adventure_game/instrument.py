@@ -0,0 +1,138 @@
+# instrument.py
+#
+# Optional per-game instrumentation: latency histograms per verb and per
+# engine handler, counters for moves, fights, saves and invalid commands,
+# and the time the GUI spends drawing output.
+#
+# Nothing in the engine pays for this while it is off. enable(game) swaps
+# timing wrappers in for the game's own methods on that one instance, so a
+# game without instrumentation runs exactly the code it always did.
+#
+# Turn it on with the ADVENTURE_STATS=1 environment variable (or call
+# enable(game)). In the game, 'stats' shows the numbers and 'stats dump'
+# writes them to stats.json.
+
+import json
+import time
+
+STATS_FILE = 'stats.json'
+
+# Engine methods timed when instrumentation is on, and the counter each one bumps
+TIMED = {
+    'move_player': 'moves',
+    'get_item': 'items taken',
+    'drop_item': 'items dropped',
+    'use_item': 'items used',
+    'combat': 'fights',
+    'save_game': 'saves',
+    'load_game': 'loads',
+    'display_location': None,
+    'check_victory_condition': None,
+}
+
+# Define the Histogram class
+class Histogram:
+    # Latencies in buckets that double in width: bucket i holds times below
+    # 2**(i + 10) ns (about 1 us, 2 us, 4 us, ...)
+    BUCKETS = 32
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, ns):
+        self.counts[min(self.BUCKETS - 1, max(0, ns.bit_length() - 10))] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, fraction):
+        # Upper edge of the bucket holding this percentile, in ns
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= fraction * self.count:
+                return min(2 ** (bucket + 10), self.max)
+        return 0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_us': round(self.total / self.count / 1000, 1) if self.count else 0,
+            'p50_us': round(self.percentile(0.5) / 1000, 1),
+            'p99_us': round(self.percentile(0.99) / 1000, 1),
+            'max_us': round(self.max / 1000, 1),
+            'buckets': self.counts,
+        }
+
+# Define the Stats class
+class Stats:
+    def __init__(self):
+        self.latency = {}   # {'verb get' or 'handler combat' or 'render': Histogram}
+        self.counters = {}  # {'moves': 3, ...}
+        self.started = time.time()
+
+    def record(self, name, ns):
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = Histogram()
+        histogram.add(ns)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self):
+        return {
+            'seconds': round(time.time() - self.started, 1),
+            'counters': dict(self.counters),
+            'latency': {name: histogram.to_dict() for name, histogram in sorted(self.latency.items())},
+        }
+
+    def report(self):
+        lines = ["Counters: " + (', '.join(f"{name} {value}" for name, value in sorted(self.counters.items())) or 'none')]
+        lines.append(f"{'timing':<34}{'count':>7}{'p50 us':>9}{'p99 us':>9}{'max us':>9}")
+        for name, histogram in sorted(self.latency.items()):
+            data = histogram.to_dict()
+            lines.append(f"{name:<34}{data['count']:>7}{data['p50_us']:>9}{data['p99_us']:>9}{data['max_us']:>9}")
+        return lines
+
+    def dump(self, path=STATS_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def timed(stats, name, counter, method):
+    def wrapper(*args, **kwargs):
+        if counter:
+            stats.count(counter)
+        started = time.perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats.record(name, time.perf_counter_ns() - started)
+    return wrapper
+
+def timed_commands(stats, game, handle_command):
+    def wrapper(action):
+        command, _ = game.commands.parse(action)
+        stats.count('commands')
+        if command is None:
+            stats.count('invalid commands')
+        started = time.perf_counter_ns()
+        try:
+            return handle_command(action)
+        finally:
+            stats.record(f"verb {command.verb if command else '(invalid)'}", time.perf_counter_ns() - started)
+    return wrapper
+
+def enable(game):
+    # Instrument this game; returns its Stats
+    if game.stats is not None:
+        return game.stats
+    stats = game.stats = Stats()
+    for name, counter in TIMED.items():
+        setattr(game, name, timed(stats, f"handler {name}", counter, getattr(game, name)))
+    game.handle_command = timed_commands(stats, game, game.handle_command)
+    return stats
@@ -0,0 +1,107 @@
+# loadgen.py
+#
+# Load generator for server.py. Opens many concurrent sessions, plays a fixed
+# walk around the castle in each one and reports sessions, commands per second
+# and command latency percentiles.
+#
+# Run against a running server:   python loadgen.py --port 8765 --sessions 200
+# Or start one in this process:   python loadgen.py --local --sessions 200
+
+import argparse
+import asyncio
+import time
+
+# A loop through rooms without enemies, so every session can keep going
+WALK = ['look', 'north', 'east', 'inventory', 'west', 'south', 'up', 'up', 'down', 'down', 'west', 'east']
+
+# Answers for the prompts the engine might ask
+PROMPT_ANSWERS = {
+    'attack': 'attack',
+    'answer': 'echo',
+    'stranger': 'no',
+}
+
+def answer_for(prompt):
+    for keyword, answer in PROMPT_ANSWERS.items():
+        if keyword in prompt:
+            return answer
+    return ''
+
+async def read_until_ready(reader, writer):
+    # Read server lines until the command completes; answer any prompts on the way
+    while True:
+        line = (await reader.readline()).decode('utf-8')
+        if not line:
+            return 'E'
+        if line.startswith('K'):
+            return 'K'
+        if line.startswith('E'):
+            return 'E'
+        if line.startswith('P'):
+            writer.write(f"{answer_for(line)}\n".encode('utf-8'))
+            await writer.drain()
+
+async def run_client(host, port, commands, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        if await read_until_ready(reader, writer) == 'E':
+            return
+        for index in range(commands):
+            command = WALK[index % len(WALK)]
+            started = time.perf_counter()
+            writer.write(f"{command}\n".encode('utf-8'))
+            await writer.drain()
+            status = await read_until_ready(reader, writer)
+            latencies.append(time.perf_counter() - started)
+            if status == 'E':
+                return
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def run_load(host, port, sessions, commands, local=False, shared=False):
+    server = None
+    if local:
+        from server import GameServer
+        server = await GameServer(host, port, shared).start()
+        port = server.port
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, commands, latencies) for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    if server:
+        await server.close()
+    return {
+        'sessions': sessions,
+        'commands': len(latencies),
+        'seconds': elapsed,
+        'commands_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against the adventure game server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--commands', type=int, default=100, help="commands per session")
+    parser.add_argument('--local', action='store_true', help="start a server in this process on a free port")
+    parser.add_argument('--shared', action='store_true', help="with --local, all sessions share one castle")
+    args = parser.parse_args()
+    port = 0 if args.local else args.port
+    result = asyncio.run(run_load(args.host, port, args.sessions, args.commands, args.local, args.shared))
+    print(f"Sessions per process: {result['sessions']}")
+    print(f"Commands: {result['commands']} in {result['seconds']:.2f}s")
+    print(f"Commands/sec: {result['commands_per_sec']:.0f}")
+    print(f"p50 latency: {result['p50_ms']:.2f} ms")
+    print(f"p99 latency: {result['p99_ms']:.2f} ms")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# montecarlo.py
+#
+# Plays thousands of seeded headless games with scripted or random agents,
+# spread over a process pool, and reports how often each ending is reached,
+# how many steps runs take and which rooms get visited most.
+#
+# Run with:  python montecarlo.py --sessions 10000 --workers 4
+#            python montecarlo.py --agent script --script walkthrough.txt --answers attack echo
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from commands import read_script
+from headless import HeadlessGUI
+from engine import Game
+
+ENDINGS = ['victory', 'bad_ending', 'secret_ending', 'death', 'quit', 'unfinished']
+
+# Define the RandomAgent class
+class RandomAgent:
+    # Picks a plausible command each turn and answers prompts at random
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def choose(self, game):
+        room = game.current_room
+        options = list(room.exits)
+        options.extend(f"get {name}" for name in room.items.stacks)
+        if game.player.has_item('health potion') and game.player.health < 60:
+            options.append('use health potion')
+        if game.mysterious_stranger['location'] == room.name:
+            options.append('talk')
+        if room.hidden_exits:
+            options.append('search')
+        options.extend(['accept quest', 'complete quest'])
+        return self.rng.choice(options)
+
+    def answer(self, prompt):
+        if 'attack' in prompt:
+            return 'attack' if self.rng.random() < 0.8 else 'run'
+        if 'stranger' in prompt:
+            return self.rng.choice(['yes', 'no'])
+        return 'echo' if self.rng.random() < 0.5 else 'wind'
+
+# Define the ScriptedAgent class
+class ScriptedAgent:
+    # Plays a fixed list of commands; prompts are answered from a list in turn
+    def __init__(self, seed, commands, answers):
+        self.commands = commands
+        self.answers = answers
+        self.step = 0
+        self.asked = 0
+
+    def choose(self, game):
+        if self.step >= len(self.commands):
+            return None
+        command = self.commands[self.step]
+        self.step += 1
+        return command
+
+    def answer(self, prompt):
+        if not self.answers:
+            return 'attack'
+        answer = self.answers[self.asked % len(self.answers)]
+        self.asked += 1
+        return answer
+
+def make_agent(seed, agent='random', commands=(), answers=()):
+    if agent == 'script':
+        return ScriptedAgent(seed, list(commands), list(answers))
+    return RandomAgent(seed)
+
+def play_session(seed, agent='random', max_steps=200, commands=(), answers=()):
+    player = make_agent(seed, agent, commands, answers)
+    gui = HeadlessGUI(on_prompt=player.answer)
+    game = Game(seed=seed)
+    gui.game = game
+    game.play(gui)
+    visits = Counter([game.current_room_name])
+    steps = 0
+    while game.running and game.player.is_alive() and steps < max_steps:
+        command = player.choose(game)
+        if command is None:
+            break
+        game.handle_command(command)
+        gui.take_output()  # Nobody reads the transcript; keep memory flat
+        visits[game.current_room_name] += 1
+        steps += 1
+    ending = game.ending or ('quit' if not game.running else 'unfinished')
+    return ending, steps, visits
+
+def run_batch(seeds, agent='random', max_steps=200, commands=(), answers=()):
+    # Runs in a worker process; returns aggregates so little data crosses back
+    endings = Counter()
+    steps_by_ending = {}
+    visits = Counter()
+    for seed in seeds:
+        ending, steps, session_visits = play_session(seed, agent, max_steps, commands, answers)
+        endings[ending] += 1
+        steps_by_ending.setdefault(ending, Counter())[steps] += 1
+        visits.update(session_visits)
+    return endings, steps_by_ending, visits
+
+def run(sessions, workers=None, agent='random', max_steps=200, seed=0, commands=(), answers=()):
+    workers = workers or os.cpu_count() or 1
+    seeds = list(range(seed, seed + sessions))
+    chunk = max(1, sessions // (workers * 8))
+    batches = [seeds[i:i + chunk] for i in range(0, sessions, chunk)]
+    endings = Counter()
+    steps_by_ending = {}
+    visits = Counter()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_batch, batch, agent, max_steps, tuple(commands), tuple(answers))
+                   for batch in batches]
+        for future in futures:
+            batch_endings, batch_steps, batch_visits = future.result()
+            endings.update(batch_endings)
+            for ending, counts in batch_steps.items():
+                steps_by_ending.setdefault(ending, Counter()).update(counts)
+            visits.update(batch_visits)
+    return {
+        'sessions': sessions,
+        'workers': workers,
+        'seconds': time.perf_counter() - started,
+        'endings': endings,
+        'steps': steps_by_ending,
+        'visits': visits,
+    }
+
+def step_percentile(counts, fraction):
+    total = sum(counts.values())
+    seen = 0
+    for steps in sorted(counts):
+        seen += counts[steps]
+        if seen >= fraction * total:
+            return steps
+    return 0
+
+def print_report(result):
+    print(f"{result['sessions']} sessions on {result['workers']} workers in {result['seconds']:.2f}s "
+          f"({result['sessions'] / result['seconds']:.0f} sessions/sec)\n")
+    print(f"{'ending':<14}{'count':>8}{'share':>8}{'steps p50':>11}{'steps p90':>11}")
+    for ending in ENDINGS:
+        count = result['endings'][ending]
+        if not count:
+            continue
+        steps = result['steps'][ending]
+        print(f"{ending:<14}{count:>8}{count / result['sessions']:>8.1%}"
+              f"{step_percentile(steps, 0.5):>11}{step_percentile(steps, 0.9):>11}")
+    print("\nRoom visits:")
+    total = sum(result['visits'].values())
+    most = max(result['visits'].values(), default=0)
+    for room, count in result['visits'].most_common():
+        bar = '#' * (40 * count // most) if most else ''
+        print(f"{room:<16}{count / total:>7.1%}  {bar}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo playthroughs of the adventure game.")
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--max-steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first session")
+    parser.add_argument('--agent', choices=['random', 'script'], default='random')
+    parser.add_argument('--script', help="script file of commands (see commands.read_script), for --agent script")
+    parser.add_argument('--answers', nargs='*', default=[], help="prompt answers for --agent script")
+    args = parser.parse_args()
+    commands = []
+    if args.agent == 'script':
+        commands = read_script(args.script)
+    print_report(run(args.sessions, args.workers, args.agent, args.max_steps, args.seed, commands, args.answers))
+
+# Main entry point
+if __name__ == "__main__":
+    main()
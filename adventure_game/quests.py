@@ -0,0 +1,124 @@
+# quests.py
+#
+# Declarative quest and ending triggers. A trigger is a list of conditions
+# and an action. Every condition names the piece of state it reads (an
+# inventory item, the current room, a flag or a quest), and the triggers are
+# indexed by those keys. The game reports which keys a command changed, and
+# only the triggers that read them are tested. Commands that touch none of
+# them cost nothing.
+
+# Define the Condition class
+class Condition:
+    def __init__(self, key, test):
+        self.key = key    # State this condition reads, e.g. ('item', 'golden apple')
+        self.test = test  # function(game) -> bool
+
+def has_item(name):
+    return Condition(('item', name), lambda game: game.player.has_item(name))
+
+def in_room(name):
+    return Condition(('room',), lambda game: game.current_room_name == name)
+
+def choice_is(value):
+    return Condition(('flag', 'player_choice'), lambda game: game.player_choice == value)
+
+def choice_is_not(value):
+    return Condition(('flag', 'player_choice'), lambda game: game.player_choice != value)
+
+def quest_is(quest, field, value=True):
+    return Condition(('quest', quest), lambda game: game.quests[quest][field] == value)
+
+# Define the Trigger class
+class Trigger:
+    def __init__(self, name, conditions, action):
+        self.name = name
+        self.conditions = conditions
+        self.action = action  # function(game)
+        self.order = 0        # Position in its TriggerSet; triggers fire in this order
+
+    def ready(self, game):
+        return all(condition.test(game) for condition in self.conditions)
+
+# Define the TriggerSet class
+class TriggerSet:
+    # The indexed trigger definitions, built once and shared by every game
+    def __init__(self, triggers=()):
+        self.triggers = []
+        self.index = {}  # {state key: [Trigger]}
+        for trigger in triggers:
+            self.register(trigger)
+
+    def register(self, trigger):
+        trigger.order = len(self.triggers)
+        self.triggers.append(trigger)
+        for key in {condition.key for condition in trigger.conditions}:
+            self.index.setdefault(key, []).append(trigger)
+        return trigger
+
+    def keys(self):
+        return self.index.keys()
+
+# Define the QuestTracker class
+class QuestTracker:
+    # Per-game record of which state changed since triggers were last checked
+    def __init__(self, trigger_set):
+        self.trigger_set = trigger_set
+        self.dirty = set()
+
+    def changed(self, key):
+        self.dirty.add(key)
+
+    def changed_all(self):
+        self.dirty.update(self.trigger_set.keys())
+
+    def run(self, game):
+        # Actions change state too, so keep going until nothing new is dirty
+        while self.dirty and game.running:
+            keys, self.dirty = self.dirty, set()
+            candidates = set()
+            for key in keys:
+                candidates.update(self.trigger_set.index.get(key, ()))
+            for trigger in sorted(candidates, key=lambda trigger: trigger.order):
+                if game.running and trigger.ready(game):
+                    trigger.action(game)
+
+# Story actions
+def deliver_cursed_amulet(game):
+    game.quests['stranger_quest']['active'] = False
+    game.quests['stranger_quest']['completed'] = True
+    game.quest_changed('stranger_quest')
+    game.gui.display_message("You have retrieved the cursed amulet for the Mysterious Stranger.", 'npc')
+    game.player.remove_item('cursed amulet')
+
+def eat_golden_apple(game):
+    game.gui.display_message("\nYou bite into the golden apple atop the tower. Enlightenment floods over you.", 'system')
+    game.gui.display_message("Congratulations, you have achieved ultimate knowledge!", 'system')
+    game.running = False
+    game.ending = 'victory'
+    game.game_over()
+
+def invoke_curse(game):
+    game.bad_ending()
+
+def reveal_secret_path(game):
+    game.gui.display_message("\nYou have completed the Mysterious Stranger's quest.", 'npc')
+    game.gui.display_message("As a reward, the stranger reveals a hidden path leading to a secret ending.", 'npc')
+    game.running = False
+    game.secret_ending()
+
+STORY = TriggerSet([
+    Trigger('deliver cursed amulet',
+            [quest_is('stranger_quest', 'active'), has_item('cursed amulet')],
+            deliver_cursed_amulet),
+    Trigger('victory',
+            [has_item('golden apple'), in_room('Tower'), choice_is_not('declined_stranger')],
+            eat_golden_apple),
+    Trigger('bad ending',
+            [has_item('golden apple'), in_room('Tower'), choice_is('declined_stranger')],
+            invoke_curse),
+    # Same test as the old check_victory_condition: the quest must be both
+    # active and completed
+    Trigger('secret ending',
+            [quest_is('stranger_quest', 'active'), quest_is('stranger_quest', 'completed')],
+            reveal_secret_path),
+])
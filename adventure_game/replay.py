@@ -0,0 +1,150 @@
+# replay.py
+#
+# Reproduces a session from its seed and command log. A game's log holds
+# every command and every prompt answer in order, and its RNG is seeded, so
+# replaying the log on a new Game with the same seed gives the same game.
+#
+# Jumping around a long session would mean replaying from the start every
+# time, so the replay keeps a snapshot (the save state, the RNG state and the
+# undo history) every `interval` commands. Seeking to a command restores the
+# nearest snapshot at or before it and replays only the commands after it.
+#
+# Saving and loading do not make a session depend on the save folder: the
+# game logs the text of every save it loads, and the replayed game loads
+# that instead of reading a file. Its own saves go to a temporary folder,
+# never to the player's.
+#
+# Logs are stored as JSON lines: a header with the seed, the world and
+# whether the game kept an undo history, then one [kind, text] entry per
+# line, appended as the game goes.
+#
+# Run with:  python replay.py session.log --to 120
+
+import argparse
+import json
+import tempfile
+from collections import deque
+
+import savefile
+from engine import Game
+from headless import HeadlessGUI
+
+SNAPSHOT_INTERVAL = 50
+
+def split_steps(log):
+    # [(command, [answers to its prompts], [save texts it loaded])] from a flat log
+    steps = []
+    for kind, text in log:
+        if kind == 'command':
+            steps.append((text, [], []))
+        elif steps:
+            steps[-1][2 if kind == 'loaded' else 1].append(text)
+    return steps
+
+def write_log(path, game):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'seed': game.seed, 'world': game.world, 'history': game.history is not None}) + '\n')
+        for entry in game.log:
+            f.write(json.dumps(entry) + '\n')
+
+def read_log(path):
+    # Returns (seed, world, log, history); logs from before 'history' was
+    # recorded come from games that always kept one
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        log = [tuple(json.loads(line)) for line in f if line.strip()]
+    return header['seed'], header['world'], log, header.get('history', True)
+
+# Define the Snapshot class
+class Snapshot:
+    def __init__(self, game, step):
+        self.step = step                       # Commands replayed before this snapshot
+        self.state = savefile.dumps(game)      # Compact save of everything a command can change
+        self.rng_state = game.rng.getstate()
+        self.log_length = len(game.log)
+        # Snapshots are shared, not copied; None if the game keeps no history
+        self.history = tuple(game.history.snapshots) if game.history is not None else None
+
+# Define the Replay class
+class Replay:
+    def __init__(self, seed, log, world=None, interval=SNAPSHOT_INTERVAL, history=True):
+        self.seed = seed
+        self.log = list(log)
+        self.world = world
+        self.history = history  # Whether the recorded game kept an undo history; 'undo' depends on it
+        self.interval = interval
+        self.steps = split_steps(self.log)
+        self.snapshots = []  # Sorted by step; built as the session is replayed forwards
+        self.replayed = 0    # Commands replayed in total, to compare against a full replay
+        self.saves = tempfile.TemporaryDirectory(prefix='adventure-replay-')  # Where replayed saves go
+
+    def __len__(self):
+        return len(self.steps)
+
+    def new_game(self):
+        gui = HeadlessGUI()
+        game = Game(self.world, seed=self.seed, history=self.history)
+        game.save_dir = self.saves.name
+        game.recorded_loads = deque()
+        gui.game = game
+        game.play(gui)
+        return game, gui
+
+    def restore(self, snapshot):
+        game, gui = self.new_game()
+        savefile.loads(game, snapshot.state)
+        game.rng.setstate(snapshot.rng_state)
+        game.log = self.log[:snapshot.log_length]
+        # A replayed 'undo' must find the same history the live game had
+        if game.history is not None:
+            game.history.snapshots.clear()
+            game.history.snapshots.extend(snapshot.history)
+            game.history.rebase(game)
+        gui.take_output()
+        return game, gui
+
+    def nearest(self, step):
+        best = None
+        for snapshot in self.snapshots:
+            if snapshot.step > step:
+                break
+            best = snapshot
+        return best
+
+    def seek(self, step):
+        # A game positioned after the first `step` commands, and its GUI
+        step = max(0, min(step, len(self.steps)))
+        snapshot = self.nearest(step)
+        if snapshot is None:
+            game, gui = self.new_game()
+            position = 0
+            self.snapshots.insert(0, Snapshot(game, 0))
+        else:
+            game, gui = self.restore(snapshot)
+            position = snapshot.step
+        while position < step:
+            command, answers, loads = self.steps[position]
+            gui.answer(*answers)
+            game.recorded_loads.extend(loads)
+            game.handle_command(command)
+            position += 1
+            self.replayed += 1
+            if position % self.interval == 0 and position > self.snapshots[-1].step:
+                self.snapshots.append(Snapshot(game, position))
+        return game, gui
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session up to any command.")
+    parser.add_argument('log', help="log written by replay.write_log")
+    parser.add_argument('--to', type=int, default=None, help="stop after this many commands (default: all)")
+    parser.add_argument('--interval', type=int, default=SNAPSHOT_INTERVAL, help="commands between snapshots")
+    args = parser.parse_args()
+    seed, world, log, history = read_log(args.log)
+    replay = Replay(seed, log, world, args.interval, history)
+    game, gui = replay.seek(len(replay) if args.to is None else args.to)
+    print(gui.transcript())
+    print(f"\n[{len(replay)} commands in the log, seed {seed}; stopped in the {game.current_room_name}]")
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# routing.py
+#
+# Shortest paths over the room graph. A breadth-first search from a room
+# builds a tree of the rooms reachable from it, but only as far as the
+# current question needs: the search stops as soon as the target is found
+# and keeps its frontier, so a later question from the same room carries on
+# where the last one stopped. Trees are cached per starting room; the cache
+# is bounded by the total number of rooms held in all trees, not by the
+# number of trees, apart from the tree used last, which is always kept.
+# Locked rooms are leaves of a tree: the route may lead up to a locked door,
+# but not through it.
+#
+# Rooms are read through World.route_info, which does not page rooms into a
+# paged world's cache, so a long search does not push out the rooms around
+# the player.
+#
+# The graph only changes when a search reveals hidden exits or a door is
+# unlocked. Both happen in one room, so only the cached trees that reached
+# that room are dropped; the rest stay valid. In a shared world another game
+# may change a route, so every router drops all its trees when the world's
+# generation has moved on.
+
+from collections import OrderedDict, deque
+
+ROUTE_CACHE_ENTRIES = 20000  # Rooms kept in all of a router's cached trees together
+
+# Define the RouteTree class
+class RouteTree:
+    def __init__(self, source):
+        self.source = source
+        self.parents = {source: None}  # {room name: (previous room name, direction)}, source maps to None
+        self.locked = set()            # Locked rooms found; the search stops at their doors
+        self.frontier = deque([source])  # Rooms reached whose exits have not been searched yet
+
+    def __len__(self):
+        return len(self.parents)
+
+    def complete(self):
+        # True once every room reachable from the source is in the tree
+        return not self.frontier
+
+    def reaches(self, name):
+        return name in self.parents
+
+    def path(self, target):
+        # Directions from the source to target, or None if it is not in the tree
+        if target not in self.parents:
+            return None
+        directions = []
+        step = self.parents[target]
+        while step is not None:
+            previous, direction = step
+            directions.append(direction)
+            step = self.parents[previous]
+        directions.reverse()
+        return directions
+
+# Define the Router class
+class Router:
+    def __init__(self, rooms, cache_entries=ROUTE_CACHE_ENTRIES):
+        self.rooms = rooms          # A World (see World.route_info)
+        self.cache_entries = cache_entries
+        self.trees = OrderedDict()  # {source room name: RouteTree}, least recently used first
+        self.entries = 0            # Rooms in all cached trees
+        self.searches = 0           # Trees started so far
+        self.expanded = 0           # Rooms whose exits were searched, in all trees
+        self.generation = rooms.generation
+
+    def tree(self, source):
+        if self.rooms.generation != self.generation:
+            self.clear()
+            self.generation = self.rooms.generation
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.trees.move_to_end(source)
+            return tree
+        self.searches += 1
+        tree = self.trees[source] = RouteTree(source)
+        self.entries += 1
+        return tree
+
+    def search(self, tree, target=None):
+        # Grow the tree until it reaches target (everything, if target is None)
+        parents = tree.parents
+        locked = tree.locked
+        frontier = tree.frontier
+        before = len(parents)
+        while frontier and target not in parents:
+            name = frontier.popleft()
+            exits, is_locked = self.rooms.route_info(name)
+            if is_locked and name != tree.source:
+                locked.add(name)
+                continue
+            self.expanded += 1
+            for direction, neighbour in exits.items():
+                if neighbour not in parents:
+                    parents[neighbour] = (name, direction)
+                    frontier.append(neighbour)
+        if tree.source in self.trees:
+            self.entries += len(parents) - before
+            self.trim(tree.source)
+        return tree
+
+    def trim(self, keep):
+        # Drop the least recently used trees until the cache fits. The tree
+        # just used is always kept, even if it is bigger than the budget on
+        # its own, so a player asking for one route after another from the
+        # same room does not search again each time.
+        while self.entries > self.cache_entries and len(self.trees) > 1:
+            source, tree = next(iter(self.trees.items()))
+            if source == keep:
+                self.trees.move_to_end(source)
+                continue
+            del self.trees[source]
+            self.entries -= len(tree)
+
+    def clear(self):
+        self.trees.clear()
+        self.entries = 0
+
+    def route(self, source, target):
+        return self.search(self.tree(source), target).path(target)
+
+    def reachable(self, source, target):
+        return self.search(self.tree(source), target).reaches(target)
+
+    def changed(self, name):
+        # Call after the exits of a room change or the room is unlocked
+        for source in [source for source, tree in self.trees.items() if tree.reaches(name)]:
+            self.entries -= len(self.trees.pop(source))
+        self.rooms.routes_changed()
+
+    def find(self, text):
+        # Room name typed by the player, ignoring case; None if there is no such room
+        return self.rooms.find(text)
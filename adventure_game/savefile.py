@@ -0,0 +1,140 @@
+# savefile.py
+#
+# Compact, versioned save format. Only the state a player can change is
+# written: current room, player stats and inventory names, per-room changes
+# against the world template, quest flags and the player's choice. Items
+# and enemies are recreated by name on load, so effects are bound to the
+# loading Game again instead of being pickled with it.
+
+import json
+import os
+import threading
+import time
+
+from entities import ItemBag
+from world import World
+
+SAVE_VERSION = 1
+SAVE_FILE = 'savegame.json'
+
+class SaveFormatError(Exception):
+    pass
+
+def room_state(room):
+    return {
+        'items': room.items.names(),
+        'enemy': [room.enemy.name, room.enemy.health] if room.enemy else None,
+        'locked': room.locked,
+        'hidden_exits': sorted(room.hidden_exits),
+    }
+
+def game_to_state(game):
+    # Only rooms in the session overlay can differ from the template
+    rooms = {}
+    for name, room in game.rooms.changed.items():
+        current = room_state(room)
+        original = room_state(game.rooms.template.rooms[name])
+        delta = {key: value for key, value in current.items() if value != original[key]}
+        if delta:
+            rooms[name] = delta
+    return {
+        'version': SAVE_VERSION,
+        'room': game.current_room.name,
+        'previous_room': game.previous_room_name,
+        'player': {
+            'health': game.player.health,
+            'attack': game.player.attack,
+            'max_weight': game.player.max_weight,
+            'inventory': game.player.inventory.names(),
+        },
+        'rooms': rooms,
+        'quests': {name: {'active': quest['active'], 'completed': quest['completed']}
+                   for name, quest in game.quests.items()},
+        'player_choice': game.player_choice,
+        'stranger': game.mysterious_stranger['location'],
+        'running': game.running,
+        'ending': game.ending,
+        'play_time': round(game.played(), 1),
+    }
+
+def apply_state(game, state):
+    if state.get('version') != SAVE_VERSION:
+        raise SaveFormatError(f"unsupported save version {state.get('version')!r}")
+    # Everything is read into a fresh overlay and local values first; the
+    # game itself is only changed once the whole save has been understood,
+    # so a save that does not fit this world leaves the game as it was
+    rooms = World(game.world_template())
+    for name, delta in state['rooms'].items():
+        room = rooms.edit(name)
+        if 'items' in delta:
+            room.items = ItemBag(game.create_item(item_name) for item_name in delta['items'])
+        if 'enemy' in delta:
+            enemy = delta['enemy']
+            room.enemy = game.create_enemy(enemy[0], health=enemy[1]) if enemy else None
+        if 'locked' in delta:
+            room.locked = delta['locked']
+        if 'hidden_exits' in delta:
+            for direction in list(room.hidden_exits):
+                if direction not in delta['hidden_exits']:
+                    room.exits[direction] = room.hidden_exits.pop(direction)
+    player = state['player']
+    inventory = ItemBag(game.create_item(item_name) for item_name in player['inventory'])
+    quests = {name: (game.quests[name], {'active': flags['active'], 'completed': flags['completed']})
+              for name, flags in state['quests'].items()}
+    current = rooms[state['room']]
+    previous = rooms[state['previous_room']] if state['previous_room'] else None
+    stranger = rooms[state['stranger']].name
+    stats = player['health'], player['attack'], player['max_weight']
+    values = state['player_choice'], state['running'], state['ending']
+    play_time = state.get('play_time', 0.0)  # Saves from before play time was recorded have none
+
+    game.create_world(rooms)
+    game.player.health, game.player.attack, game.player.max_weight = stats
+    game.player.inventory = inventory
+    for quest, flags in quests.values():
+        quest.update(flags)
+    game.current_room = current
+    game.previous_room = previous
+    game.player_choice, game.running, game.ending = values
+    game.mysterious_stranger['location'] = stranger
+    game.play_time = play_time
+    game.session_started = time.monotonic()
+    # Everything may have changed, so every trigger gets checked again
+    game.triggers.changed_all()
+
+def dumps(game):
+    return json.dumps(game_to_state(game), separators=(',', ':'))
+
+def loads(game, data):
+    try:
+        state = json.loads(data)
+    except ValueError as e:
+        raise SaveFormatError(f"corrupt save data: {e}") from e
+    try:
+        apply_state(game, state)
+    except (KeyError, TypeError, IndexError, AttributeError, ValueError) as e:
+        raise SaveFormatError(f"save does not match this world: {e!r}") from e
+
+def write_atomic(path, data, sync=True):
+    # Write a temporary file next to the save and rename it over the old one,
+    # so a crash mid-write leaves the previous save intact. sync=False skips
+    # the fsync for files that can be rebuilt if the machine loses power.
+    temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+def save(game, path=SAVE_FILE):
+    write_atomic(path, dumps(game))
+
+def load(game, path=SAVE_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        loads(game, f.read())
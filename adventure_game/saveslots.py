@@ -0,0 +1,197 @@
+# saveslots.py
+#
+# Named save slots. Every slot is a savefile.py save in its own file under
+# saves/, and saves/index.jsonl keeps a short summary of each one: the room,
+# health, quest flags, play time and when it was saved. Listing the slots
+# reads only the index, however many saves there are; a save file itself is
+# read only when its slot is loaded.
+#
+# The index is a journal: one line per change, {"slot": ..., "summary": ...}
+# (a null summary forgets the slot), later lines winning. A save appends one
+# line instead of rewriting the whole index, and the journal is rewritten
+# (atomically) with one line per slot once it has grown to twice that. Each
+# folder's index is kept in memory once read, and read again only if the
+# file's size or modification time shows that someone else changed it. If
+# the index is missing or damaged it is rebuilt from the save files.
+
+import json
+import os
+import re
+import threading
+import time
+
+import savefile
+
+SAVE_DIR = 'saves'
+INDEX_FILE = 'index.jsonl'
+DEFAULT_SLOT = 'quicksave'
+SLOT_NAME = re.compile(r'[a-z0-9_-]{1,32}$')
+COMPACT_LINES = 64  # The journal is never rewritten while it is shorter than this
+
+# Reading or changing an index is read-modify-write, and a game's own thread
+# and its autosaver's thread may both save into the same directory
+_index_lock = threading.Lock()
+
+# Define the CachedIndex class
+class CachedIndex:
+    def __init__(self, index, lines, signature):
+        self.index = index          # {slot: summary}
+        self.lines = lines          # Lines in the journal; None if it must be rewritten before appending
+        self.signature = signature  # (mtime_ns, size) of the journal when this process last read or wrote it
+
+# Indexes read so far: {absolute directory: CachedIndex}
+_indexes = {}
+
+def valid_slot(slot):
+    return bool(SLOT_NAME.match(slot)) and slot != os.path.splitext(INDEX_FILE)[0]
+
+def slot_path(slot, directory=SAVE_DIR):
+    if not valid_slot(slot):
+        raise ValueError(f"invalid slot name {slot!r}")
+    return os.path.join(directory, f"{slot}.json")
+
+def summary(state, saved_at):
+    return {
+        'room': state['room'],
+        'health': state['player']['health'],
+        'quests': state['quests'],
+        'play_time': state.get('play_time', 0),
+        'saved_at': saved_at,
+    }
+
+def file_signature(path):
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+def index_line(slot, info):
+    return json.dumps({'slot': slot, 'summary': info}, separators=(',', ':')) + '\n'
+
+def write_index(index, directory=SAVE_DIR):
+    # Rewrite the journal with one line per slot. No fsync: an index lost
+    # with the power is rebuilt from the saves
+    path = os.path.join(directory, INDEX_FILE)
+    savefile.write_atomic(path, ''.join(index_line(slot, info) for slot, info in index.items()), sync=False)
+    _indexes[os.path.abspath(directory)] = CachedIndex(index, len(index), file_signature(path))
+
+def parse_index(data):
+    # Returns (index, lines); lines is None if the last line was cut short by
+    # a crash. Raises ValueError if the journal is damaged anywhere else
+    index = {}
+    lines = data.splitlines()
+    for number, line in enumerate(lines):
+        try:
+            entry = json.loads(line)
+            slot = entry['slot']
+            info = entry['summary']
+        except (ValueError, KeyError, TypeError):
+            if number == len(lines) - 1:
+                return index, None
+            raise ValueError(f"damaged index line {number + 1}")
+        if info is None:
+            index.pop(slot, None)
+        else:
+            index[slot] = info
+    return index, len(lines)
+
+def rebuild_index(directory=SAVE_DIR):
+    # Summarize every save file again; only needed when the index was lost
+    index = {}
+    for name in sorted(os.listdir(directory)):
+        slot = name[:-len('.json')]
+        if not name.endswith('.json') or not valid_slot(slot):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index[slot] = summary(json.load(f), os.path.getmtime(path))
+        except (OSError, ValueError, KeyError, TypeError):
+            continue  # Not a save this game can read
+    write_index(index, directory)
+    return index
+
+def cached_index(directory):
+    # The directory's CachedIndex, read again only if the file changed behind
+    # this process's back; the caller holds _index_lock
+    path = os.path.join(directory, INDEX_FILE)
+    signature = file_signature(path)
+    cached = _indexes.get(os.path.abspath(directory))
+    if cached is not None and signature is not None and cached.signature == signature:
+        return cached
+    if signature is None and not os.path.isdir(directory):
+        return CachedIndex({}, None, None)  # Nothing saved here yet
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index, lines = parse_index(f.read())
+    except (FileNotFoundError, ValueError):
+        rebuild_index(directory)
+        return _indexes[os.path.abspath(directory)]
+    cached = _indexes[os.path.abspath(directory)] = CachedIndex(index, lines, signature)
+    return cached
+
+def record(slot, info, directory=SAVE_DIR):
+    # Set a slot's summary in the index, or forget the slot if info is None;
+    # the caller holds _index_lock
+    cached = cached_index(directory)
+    if info is None:
+        cached.index.pop(slot, None)
+    else:
+        cached.index[slot] = info
+    if cached.lines is None or cached.lines >= max(COMPACT_LINES, 2 * len(cached.index)):
+        write_index(cached.index, directory)
+        return
+    path = os.path.join(directory, INDEX_FILE)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(index_line(slot, info))
+    cached.lines += 1
+    cached.signature = file_signature(path)
+
+def read_index(directory=SAVE_DIR):
+    # {slot: summary}
+    with _index_lock:
+        return dict(cached_index(directory).index)
+
+def write_slot(slot, state, directory=SAVE_DIR):
+    # Write a save state (savefile.game_to_state) to a slot and record it in the index
+    path = slot_path(slot, directory)
+    with _index_lock:
+        os.makedirs(directory, exist_ok=True)
+        savefile.write_atomic(path, json.dumps(state, separators=(',', ':')))
+        record(slot, summary(state, time.time()), directory)
+
+def save(game, slot=DEFAULT_SLOT, directory=SAVE_DIR):
+    write_slot(slot, savefile.game_to_state(game), directory)
+
+def read(slot, directory=SAVE_DIR):
+    # The text of a slot's save file
+    path = slot_path(slot, directory)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        # The file was removed behind the index's back; forget the slot
+        with _index_lock:
+            if slot in cached_index(directory).index:
+                record(slot, None, directory)
+        raise
+
+def load(game, slot=DEFAULT_SLOT, directory=SAVE_DIR):
+    savefile.loads(game, read(slot, directory))
+
+def list_slots(directory=SAVE_DIR):
+    # [(slot, summary)], most recently saved first
+    return sorted(read_index(directory).items(), key=lambda entry: entry[1]['saved_at'], reverse=True)
+
+def format_play_time(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+def describe(slot, info):
+    # One line for the 'saves' listing
+    completed = sum(1 for flags in info['quests'].values() if flags['completed'])
+    saved = time.strftime('%Y-%m-%d %H:%M', time.localtime(info['saved_at']))
+    return (f"{slot:<16} {info['room']:<20} health {info['health']:>3}  "
+            f"quests {completed}/{len(info['quests'])}  played {format_play_time(info['play_time'])}  {saved}")
@@ -0,0 +1,184 @@
+# server.py
+#
+# Asyncio game server: one Game per TCP connection, spoken over a simple line
+# protocol. Every session has its own engine thread, so the event loop keeps
+# serving other sessions while a command runs. When the engine asks a
+# question, that thread waits on an awaitable prompt that the event loop
+# answers with the client's next line; a player thinking it over holds
+# nothing other sessions need. A prompt left unanswered for --prompt-timeout
+# seconds ends the session.
+#
+# Every connection normally gets a castle of its own, and a save folder of
+# its own in a temporary directory, removed when the connection closes; a
+# player's saves are never seen by anyone else. With --shared all players
+# explore one castle together: an item taken by one is gone for the others
+# and a defeated enemy stays defeated (see world.SharedWorld). Shared games
+# cannot be saved. 'undo' keeps a snapshot after every command, so it is off
+# unless the server is started with --undo (and never in a shared world).
+#
+# Protocol (one line each, UTF-8):
+#   client -> server:  a command (or several, separated by ';'), or the
+#                      answer to the last prompt
+#   server -> client:  "O <text>"    one line of game output
+#                      "P <prompt>"  the engine is waiting for an answer
+#                      "K"           the command finished, send the next one
+#                      "E <ending>"  the game is over, the server will hang up
+#
+# Run with:  python server.py --port 8765 [--shared] [--undo]
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from commands import split_batch
+from engine import Game, GameInterface
+from world import SharedWorld
+from world_data import read_world
+
+PROMPT_TIMEOUT = 300  # Seconds a session may sit on an unanswered prompt
+
+# Define the SessionGUI class
+class SessionGUI(GameInterface):
+    def __init__(self, session):
+        self.session = session
+        self.pending = []  # Output produced since the last flush
+        self.game = None
+
+    def display_message(self, message, msg_type='system'):
+        self.pending.extend(message.split('\n'))
+
+    def get_player_input(self, prompt=""):
+        # Runs on the session's engine thread: hand the prompt to the event
+        # loop and block until the client has answered (or the prompt timed out)
+        future = asyncio.run_coroutine_threadsafe(self.session.prompt(prompt), self.session.loop)
+        return future.result()
+
+    def quit_game(self):
+        self.game.running = False
+
+    def take_pending(self):
+        pending = self.pending
+        self.pending = []
+        return pending
+
+# Define the Session class
+class Session:
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.gui = SessionGUI(self)
+        self.game = Game(shared=server.world, history=server.undo)
+        self.gui.game = self.game
+        self.save_dir = None
+        if server.world is None:
+            self.save_dir = self.game.save_dir = tempfile.mkdtemp(prefix='adventure-saves-')
+        # One thread for this session's engine; it is only busy while a command runs or a prompt waits
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session')
+
+    async def read_line(self):
+        line = await self.reader.readline()
+        if not line:
+            return None
+        return line.decode('utf-8', 'replace').strip()
+
+    async def send(self, *lines):
+        self.writer.write(''.join(f"{line}\n" for line in lines).encode('utf-8'))
+        await self.writer.drain()
+
+    async def flush(self, status):
+        await self.send(*(f"O {line}" for line in self.gui.take_pending()), status)
+
+    async def prompt(self, prompt):
+        await self.flush(f"P {prompt.strip()}")
+        try:
+            answer = await asyncio.wait_for(self.read_line(), self.server.prompt_timeout)
+        except asyncio.TimeoutError:
+            await self.send(f"O No answer for {self.server.prompt_timeout:g} seconds. Goodbye!")
+            raise EOFError("Prompt timed out") from None
+        if answer is None:
+            # Client went away in the middle of a prompt
+            raise EOFError("Client disconnected")
+        return answer
+
+    def echo(self, command):
+        self.gui.display_message(f"> {command}", 'input')
+
+    async def run_engine(self, function, *args):
+        await self.loop.run_in_executor(self.executor, function, *args)
+
+    async def run(self):
+        await self.run_engine(self.game.play, self.gui)
+        await self.flush('K')
+        while self.game.running:
+            command = await self.read_line()
+            if command is None:
+                return
+            # 'north; get key; south' runs as one batch and gets one reply
+            commands = split_batch(command.lower()) or [command]
+            await self.run_engine(self.game.run_batch, commands, self.echo)
+            if self.game.running:
+                await self.flush('K')
+        await self.flush(f"E {self.game.ending or 'quit'}")
+
+# Define the GameServer class
+class GameServer:
+    def __init__(self, host='127.0.0.1', port=8765, shared=False, prompt_timeout=PROMPT_TIMEOUT, undo=False):
+        self.host = host
+        self.port = port
+        self.world = SharedWorld(read_world()) if shared else None  # One castle for every session, held in memory
+        self.prompt_timeout = prompt_timeout
+        self.undo = undo  # Whether sessions keep an undo history
+        self.sessions = set()
+        self.server = None
+
+    async def handle_client(self, reader, writer):
+        session = Session(self, reader, writer)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except (ConnectionError, EOFError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            session.executor.shutdown(wait=False)
+            if session.save_dir:
+                shutil.rmtree(session.save_dir, ignore_errors=True)
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        # Port 0 asks the OS for a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving {'a shared' if self.world else 'the'} adventure on {self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the adventure game over TCP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--shared', action='store_true', help="all players share one castle")
+    parser.add_argument('--prompt-timeout', type=float, default=PROMPT_TIMEOUT,
+                        help="seconds before an unanswered prompt ends the session")
+    parser.add_argument('--undo', action='store_true', help="let players use 'undo' and 'rewind'")
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer(args.host, args.port, args.shared, args.prompt_timeout, args.undo).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# test_autosave.py
+#
+# Saves written on the autosaver's thread must not fail silently: 'save'
+# reports its own failure, a failed autosave is reported the next time the
+# player saves, loads or lists the saves, and an unexpected exception in a
+# write leaves the worker running, so a later load does not wait forever.
+#
+# Run from the adventure_game directory:  python -m pytest tests
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import saveslots
+from autosave import AutoSaver
+from headless import new_session
+
+# Define the AutoSaveErrorTest class
+class AutoSaveErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.quiet = contextlib.redirect_stdout(io.StringIO())  # save_game and load_game print
+        self.quiet.__enter__()
+        self.addCleanup(self.quiet.__exit__, None, None, None)
+        self.game, self.gui = new_session(seed=1)
+        self.game.autosaver = AutoSaver()
+        self.addCleanup(self.game.autosaver.close)
+        self.gui.take_output()
+
+    def messages(self, command):
+        self.game.handle_command(command)
+        return [message for message, msg_type in self.gui.take_output()]
+
+    def test_failed_save_is_reported(self):
+        blocked = os.path.join(self.directory, 'not-a-folder')
+        open(blocked, 'w').close()
+        self.game.save_dir = blocked
+        messages = self.messages('save')
+        self.assertTrue(any(message.startswith("The game could not be saved to 'quicksave'") for message in messages))
+        self.assertNotIn("Game saved to 'quicksave'.", messages)
+
+        self.game.handle_command('north')  # Autosaves, and fails, on the worker thread
+        self.game.autosaver.flush()
+        messages = self.messages('saves')
+        self.assertTrue(any(message.startswith("Saving to 'autosave' failed") for message in messages))
+        self.assertFalse(any(message.startswith("Saving to 'autosave' failed") for message in self.messages('saves')))
+
+    def test_unexpected_error_keeps_the_worker_running(self):
+        self.game.save_dir = self.directory
+        self.game.handle_command('look')  # The autosaver notes the room it starts in
+        with mock.patch.object(saveslots, 'write_slot', side_effect=ValueError('broken state')):
+            self.game.handle_command('north')
+            self.assertTrue(self.game.autosaver.flush(5))
+        self.assertTrue(self.game.autosaver.thread.is_alive())
+        self.assertFalse(self.game.autosaver.writing)
+        messages = self.messages('load autosave')
+        self.assertIn("Saving to 'autosave' failed: broken state", messages)
+        self.assertIn("Game saved to 'quicksave'.", self.messages('save'))
+
+# Main entry point
+if __name__ == "__main__":
+    unittest.main()
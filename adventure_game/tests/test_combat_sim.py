@@ -0,0 +1,46 @@
+# test_combat_sim.py
+#
+# combat_sim.py works fights out in closed form instead of playing them. On
+# random player and enemy stats its win, turns and remaining health must
+# match what Game.combat does when the player attacks until the fight ends.
+#
+# Run from the adventure_game directory:  python -m pytest tests
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from combat_sim import simulate
+from entities import Enemy, EnemyType
+from headless import new_session
+
+FIGHTS = 300
+
+# Define the CombatSimTest class
+class CombatSimTest(unittest.TestCase):
+    def fight(self, health, attack, enemy_health, enemy_attack):
+        # Play one fight in a headless game, always attacking
+        game, gui = new_session(on_prompt=lambda prompt: 'attack', seed=1)
+        game.player.health = health
+        game.player.attack = attack
+        gui.take_output()
+        game.combat(Enemy(EnemyType('training dummy', enemy_health, enemy_attack, "")))
+        turns = sum(message.startswith("You attack the") for message, msg_type in gui.take_output())
+        return game.player.is_alive(), turns, game.player.health
+
+    def test_matches_game_combat(self):
+        rng = random.Random(11)
+        stats = [(rng.randint(1, 200), rng.randint(1, 60), rng.randint(1, 150), rng.randint(0, 40))
+                 for _ in range(FIGHTS)]
+        result = simulate(*zip(*stats))
+        for i, (health, attack, enemy_health, enemy_attack) in enumerate(stats):
+            with self.subTest(health=health, attack=attack, enemy_health=enemy_health, enemy_attack=enemy_attack):
+                expected = (bool(result['win'][i]), int(result['turns'][i]), int(result['remaining'][i]))
+                self.assertEqual(self.fight(health, attack, enemy_health, enemy_attack), expected)
+
+# Main entry point
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# test_replay.py
+#
+# A replayed session must end up exactly where the live one was, after any
+# number of commands, including sessions that save and load. The live games
+# save into a temporary folder that is deleted before replaying, so a replay
+# that reads or writes save files instead of using its log fails here.
+#
+# Run from the adventure_game directory:  python -m pytest tests
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import savefile
+import saveslots
+from engine import Game
+from headless import HeadlessGUI
+from replay import Replay, read_log, write_log
+
+COMMANDS = ['north', 'south', 'east', 'west', 'up', 'look', 'search', 'get spellbook', 'get sword',
+            'get key', 'drop key', 'drop sword', 'talk', 'inventory', 'undo', 'rewind 2']
+SAVE_COMMANDS = ['save', 'save slot-a', 'load', 'load slot-a', 'load earlier', 'load missing', 'saves']
+ANSWERS = ['attack', 'attack', 'attack', 'run', 'echo', 'yes', 'no']
+
+def state_of(game):
+    # Everything a save records, except the play time, which depends on the clock
+    state = savefile.game_to_state(game)
+    del state['play_time']
+    return state
+
+def earlier_save(directory):
+    # A slot written before the session started, by another game
+    gui = HeadlessGUI(on_prompt=lambda prompt: 'attack')
+    game = Game(seed=12345)
+    gui.game = game
+    game.play(gui)
+    for command in ['north', 'get spellbook', 'south', 'east']:
+        game.handle_command(command)
+    saveslots.save(game, 'earlier', directory)
+
+def play_live(seed, save_dir, commands, history, steps=120):
+    # Returns the game and its state after each command
+    rng = random.Random(seed)
+    gui = HeadlessGUI(on_prompt=lambda prompt: rng.choice(ANSWERS))
+    game = Game(seed=seed, history=history)
+    game.save_dir = save_dir
+    gui.game = game
+    game.play(gui)
+    states = [state_of(game)]
+    for _ in range(steps):
+        if not game.running or not game.player.is_alive():
+            break
+        game.handle_command(rng.choice(commands))
+        states.append(state_of(game))
+    return game, states
+
+# Define the ReplayTest class
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.quiet = contextlib.redirect_stdout(io.StringIO())  # save_game and load_game print
+        self.quiet.__enter__()
+        self.addCleanup(self.quiet.__exit__, None, None, None)
+
+    def replay_session(self, seed, with_saves, history=True):
+        save_dir = os.path.join(self.directory, f"saves-{seed}")
+        os.makedirs(save_dir)
+        if with_saves:
+            earlier_save(save_dir)
+        game, states = play_live(seed, save_dir, COMMANDS + SAVE_COMMANDS if with_saves else COMMANDS, history)
+        log_path = os.path.join(self.directory, f"session-{seed}.log")
+        write_log(log_path, game)
+        # The replay must not need the live game's saves, nor touch them
+        shutil.rmtree(save_dir)
+        saved_seed, world, log, kept_history = read_log(log_path)
+        replay = Replay(saved_seed, log, world, interval=7, history=kept_history)
+        self.assertEqual(len(replay), len(states) - 1)
+
+        rng = random.Random(seed)
+        positions = [len(replay)] + [rng.randrange(len(replay) + 1) for _ in range(12)]
+        for position in positions:
+            replayed, _ = replay.seek(position)
+            self.assertEqual(state_of(replayed), states[position], f"seed {seed}, step {position}")
+        self.assertFalse(os.path.exists(save_dir))
+
+    def test_replay_matches_live_session(self):
+        for seed in range(15):
+            self.replay_session(seed, with_saves=False)
+
+    def test_replay_with_saves_and_loads(self):
+        for seed in range(30):
+            self.replay_session(seed, with_saves=True)
+
+    def test_replay_without_history(self):
+        # 'undo' only says it is turned off, in the live game and the replay alike
+        for seed in range(10):
+            self.replay_session(seed, with_saves=True, history=False)
+
+# Main entry point
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# test_savefile.py
+#
+# A save loaded into a new game gives back the state it was written from,
+# including exits a search revealed and the health of a wounded enemy. A save
+# that cannot be loaded raises SaveFormatError and leaves the game as it was.
+#
+# Run from the adventure_game directory:  python -m pytest tests
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import savefile
+from headless import new_session
+
+def state_of(game):
+    # Everything a save records, except the play time, which depends on the clock
+    state = savefile.game_to_state(game)
+    del state['play_time']
+    return state
+
+# Define the SaveFileTest class
+class SaveFileTest(unittest.TestCase):
+    def setUp(self):
+        # Reveal the cave north of the garden, wound the goblin and run, pick up a potion
+        self.game, self.gui = new_session(answers=['attack', 'run'], seed=1)
+        for command in ['west', 'search', 'east', 'east', 'north', 'get health potion']:
+            self.game.handle_command(command)
+        self.gui.take_output()
+
+    def test_round_trip(self):
+        data = savefile.dumps(self.game)
+        game, gui = new_session(seed=2)
+        savefile.loads(game, data)
+        self.assertEqual(state_of(game), state_of(self.game))
+        self.assertEqual(game.rooms['Garden'].exits['north'], 'Secret Cave')
+        self.assertEqual(game.rooms['Armory'].enemy.health, 15)
+        self.assertEqual(game.current_room.name, 'Library')
+        self.assertEqual(game.player.inventory.names(), ['health potion'])
+
+    def test_corrupt_save_leaves_the_game_alone(self):
+        valid = json.loads(savefile.dumps(self.game))
+        game, gui = new_session(seed=2)
+        game.handle_command('up')
+        before = state_of(game)
+        room = game.current_room
+        # Cut short, and well-formed but naming a room this world does not have
+        # after the rooms and player were already read
+        for data in [savefile.dumps(self.game)[:-20], json.dumps(dict(valid, stranger='Nowhere'))]:
+            with self.subTest(data=data[-40:]):
+                with self.assertRaises(savefile.SaveFormatError):
+                    savefile.loads(game, data)
+                self.assertEqual(state_of(game), before)
+                self.assertIs(game.current_room, room)
+
+# Main entry point
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# test_server.py
+#
+# Players on one server never see each other's saves. Without --shared every
+# connection saves into a folder of its own, removed when it hangs up; with
+# --shared, save, load and saves are turned off, so nobody reaches the save
+# folder in the server's working directory.
+#
+# Run from the adventure_game directory:  python -m pytest tests
+
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import saveslots
+from headless import new_session
+from server import GameServer
+
+async def until_ready(reader):
+    # Output lines up to and including the next K, P or E line
+    lines = []
+    while True:
+        line = (await reader.readline()).decode('utf-8').rstrip('\n')
+        if not line:
+            return lines + ['<closed>']
+        lines.append(line)
+        if line.startswith(('K', 'P', 'E')):
+            return lines
+
+async def connect(server):
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    await until_ready(reader)
+    return reader, writer
+
+async def send(client, line):
+    reader, writer = client
+    writer.write(f"{line}\n".encode('utf-8'))
+    return await until_ready(reader)
+
+# Define the SessionIsolationTest class
+class SessionIsolationTest(unittest.TestCase):
+    def setUp(self):
+        # The server's working directory, with another game's save in saves/
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.directory)
+        game, gui = new_session(seed=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            saveslots.save(game, 'mysecret')
+        self.before = sorted(os.listdir(saveslots.SAVE_DIR))
+
+    def play(self, shared, script):
+        async def main():
+            server = await GameServer(port=0, shared=shared).start()
+            try:
+                return await script(server)
+            finally:
+                await server.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return asyncio.run(main())
+
+    def test_sessions_have_their_own_saves(self):
+        async def script(server):
+            first = await connect(server)
+            second = await connect(server)
+            await send(first, 'north; get spellbook; save')
+            seen = await send(second, 'saves; load')
+            folders = [session.save_dir for session in server.sessions]
+            for _, writer in (first, second):
+                writer.close()
+            await asyncio.sleep(0.3)
+            return seen, folders
+        seen, folders = self.play(False, script)
+        self.assertIn("O There are no saved games.", seen)
+        self.assertIn("O There is no saved game 'quicksave'. Type 'saves' to list them.", seen)
+        self.assertFalse(any(line.startswith('O mysecret') for line in seen))
+        self.assertEqual(len(set(folders)), 2)
+        self.assertFalse(any(os.path.exists(folder) for folder in folders))
+        self.assertEqual(sorted(os.listdir(saveslots.SAVE_DIR)), self.before)
+
+    def test_shared_world_has_no_saves(self):
+        async def script(server):
+            client = await connect(server)
+            seen = await send(client, 'saves; save; load mysecret')
+            client[1].close()
+            await asyncio.sleep(0.3)
+            return seen
+        seen = self.play(True, script)
+        self.assertIn("O Saved games are not available in a shared world.", seen)
+        self.assertIn("O Saving is not available in a shared world.", seen)
+        self.assertIn("O Loading is not available in a shared world.", seen)
+        self.assertFalse(any(line.startswith('O mysecret') for line in seen))
+        self.assertEqual(sorted(os.listdir(saveslots.SAVE_DIR)), self.before)
+
+# Main entry point
+if __name__ == "__main__":
+    unittest.main()
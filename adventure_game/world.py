@@ -0,0 +1,249 @@
+# world.py
+#
+# Item and enemy content and the per-session view of a world. World layouts
+# are data files (see world_data.py), loaded once per process into a
+# read-only WorldTemplate. Each Game gets a World, which hands
+# out the shared template rooms until a room is changed; the first change
+# copies that room into the session's overlay. A session therefore only pays
+# for the rooms its player has actually changed. A SharedWorld is one World
+# played by many games at once, each room guarded by its own lock.
+
+import contextlib
+import threading
+from types import MappingProxyType
+
+from entities import Item, Enemy, EnemyType
+
+# Item effects: function(player, gui)
+def heal_player(player, gui):
+    player.health += 30
+    gui.display_message("You use a health potion and recover 30 health points.", 'system')
+    gui.display_message(f"Your health is now {player.health}.", 'system')
+
+def increase_attack(player, gui):
+    player.attack += 10
+    gui.display_message("You feel a surge of power. Your attack increases by 10!", 'system')
+
+def increase_attack_power(player, gui):
+    player.attack += 20
+    gui.display_message("You feel immense power coursing through you. Your attack increases by 20!", 'system')
+
+def increase_attack_power_quest(player, gui):
+    player.attack += 15
+    gui.display_message("The ring glows as you wear it. Your attack increases by 15!", 'system')
+
+EFFECTS = {
+    'heal_player': heal_player,
+    'increase_attack': increase_attack,
+    'increase_attack_power': increase_attack_power,
+    'increase_attack_power_quest': increase_attack_power_quest,
+}
+
+# Item definitions: name -> (description, weight, name of the effect in EFFECTS)
+ITEM_TYPES = {
+    'spellbook': ('An ancient spellbook filled with arcane knowledge.', 5, None),
+    'sword': ('A sharp-looking sword.', 10, None),
+    'shield': ('A sturdy shield.', 8, None),
+    'key': ('A small rusty key.', 1, None),
+    'health potion': ('A potion that restores health.', 2, 'heal_player'),
+    'mysterious amulet': ('An amulet that radiates power.', 3, 'increase_attack'),
+    'golden apple': ('A golden apple that shines brightly.', 2, None),
+    'magic lamp': ('A lamp that seems to contain something magical.', 4, None),
+    'ancient sword': ('A sword with mystical powers.', 10, 'increase_attack_power'),
+    'star map': ('A map of the stars that reveals hidden truths.', 1, None),
+    'lost crown': ('An ornate crown that seems important.', 2, None),
+    'cursed amulet': ('An amulet with dark energy.', 2, None),
+    'ring of power': ('An enchanted ring that increases your attack.', 1, 'increase_attack_power_quest'),
+    # Random treasures
+    'bag of gold': ('A heavy bag filled with gold coins.', 5, None),
+    'gemstone': ('A sparkling gemstone.', 3, None),
+    'ancient artifact': ('An artifact from a bygone era.', 7, None),
+    'whoopee cushion': ('A classic prank item.', 1, None),
+}
+
+# Enemy definitions: name -> (health, attack, description)
+ENEMY_TYPES = {
+    'Goblin': (30, 10, 'A sneaky goblin.'),
+    'Dragon': (100, 25, 'A massive dragon with fiery breath.'),
+    'Evil Spirit': (50, 15, 'A malevolent entity.'),
+    # Random enemies
+    'Ghost': (20, 5, 'A spooky ghost.'),
+    'Zombie': (25, 7, 'A shambling zombie.'),
+    'Annoyed Squirrel': (10, 3, 'A small but fierce squirrel.'),
+}
+
+# Tables for random spawns; generated worlds draw from the same tables
+RANDOM_ENEMIES = ['Ghost', 'Zombie', 'Annoyed Squirrel']
+RANDOM_TREASURES = ['bag of gold', 'gemstone', 'ancient artifact', 'whoopee cushion']
+
+# Items never change once created, so one Item per name is shared everywhere
+_items = {}
+
+def make_item(name):
+    item = _items.get(name)
+    if item is None:
+        description, weight, effect = ITEM_TYPES[name]
+        item = Item(name, description, weight=weight, effect=EFFECTS[effect] if effect else None)
+        _items[name] = item
+    return item
+
+# Enemy stats are shared the same way; each Enemy only carries its health
+_enemy_types = {}
+
+def enemy_type(name):
+    kind = _enemy_types.get(name)
+    if kind is None:
+        kind = EnemyType(name, *ENEMY_TYPES[name])
+        _enemy_types[name] = kind
+    return kind
+
+def make_enemy(name, health=None):
+    return Enemy(enemy_type(name), health)
+
+def freeze_room(room):
+    # Template rooms are shared by every session, so make accidental
+    # changes fail loudly instead of leaking into other games
+    room.items.freeze()
+    room.exits = MappingProxyType(room.exits)
+    room.hidden_exits = MappingProxyType(room.hidden_exits)
+    return room
+
+# Define the WorldTemplate class
+class WorldTemplate:
+    def __init__(self, rooms, start, stranger_location, quest_reward):
+        self.rooms = rooms                          # Dictionary: {name: Room}
+        self.start = start                          # Name of the starting room
+        self.stranger_location = stranger_location  # Name of the Mysterious Stranger's room
+        self.quest_reward = quest_reward            # Item given for the main quest
+        self.names = None                           # {lowercase name: room name}, built on first lookup
+        self.freeze()
+
+    def freeze(self):
+        for room in self.rooms.values():
+            freeze_room(room)
+
+    def visit(self, name):
+        # Called when the player enters a room; paged templates load nearby rooms here
+        pass
+
+    def route_info(self, name):
+        # (exits, locked) of a room, for routing.Router
+        room = self.rooms[name]
+        return room.exits, room.locked
+
+    def find(self, text):
+        # Room name typed by a player, ignoring case; None if there is no such
+        # room. The lookup is built once per template, not once per game
+        if text in self.rooms:
+            return text
+        if self.names is None:
+            self.names = {name.lower(): name for name in self.rooms.keys()}
+        return self.names.get(text.strip().lower())
+
+# Define the World class
+class World:
+    generation = 0  # Bumped by SharedWorld whenever a route changes; see routing.Router
+
+    def __init__(self, template):
+        self.template = template
+        self.changed = {}    # Session copies of changed rooms: {name: Room}
+        self.edited = set()  # Rooms in `changed` that are this session's alone; the rest are shared with undo snapshots
+
+    def __getitem__(self, name):
+        room = self.changed.get(name)
+        if room is None:
+            room = self.template.rooms[name]
+        return room
+
+    def __contains__(self, name):
+        return name in self.template.rooms
+
+    def __iter__(self):
+        return iter(self.template.rooms)
+
+    def __len__(self):
+        return len(self.template.rooms)
+
+    def keys(self):
+        return self.template.rooms.keys()
+
+    def items(self):
+        return ((name, self[name]) for name in self.template.rooms)
+
+    def values(self):
+        return (self[name] for name in self.template.rooms)
+
+    def visit(self, name):
+        self.template.visit(name)
+
+    def find(self, text):
+        return self.template.find(text)
+
+    def route_info(self, name):
+        # (exits, locked) of a room, without paging it into a paged template's cache
+        room = self.changed.get(name)
+        if room is None:
+            return self.template.route_info(name)
+        return room.exits, room.locked
+
+    def lock(self, name):
+        # Hold while reading or changing a room that other games may change
+        # too; a World is played by one game, so there is nothing to wait for
+        return NO_LOCK
+
+    def routes_changed(self):
+        # The game's own router has already been told which room changed
+        pass
+
+    def edit(self, name):
+        # Copy-on-write: return this session's own copy of the room. A room
+        # is copied again on its first edit after each undo snapshot, so the
+        # snapshot keeps the room as it was (see history.py). Every change to
+        # a room goes through here, so this is also where its rendered view
+        # is dropped; untouched rooms keep theirs, snapshots included
+        if name in self.edited:
+            room = self.changed[name]
+            room.view = None
+            return room
+        room = self.changed.get(name) or self.template.rooms[name]
+        room = self.changed[name] = room.copy()
+        self.edited.add(name)
+        return room
+
+NO_LOCK = contextlib.nullcontext()
+
+# Define the SharedWorld class
+class SharedWorld(World):
+    # One set of rooms played by many games at once (server.py --shared).
+    # Every room has its own lock, so players in different rooms never wait
+    # for each other. Games hold lock(name) while they read or change a
+    # room's items, enemy or lock, and never while waiting for a player's
+    # answer. Exits are replaced, not changed in place (Room.search), so
+    # routes can be searched without locks. The template should be an
+    # in-memory WorldTemplate (world_data.read_world): every room read from
+    # a paged template goes through the pager's one lock.
+    def __init__(self, template):
+        super().__init__(template)
+        self.locks = {}  # {room name: RLock}, made on first use
+        self.guard = threading.Lock()
+
+    def lock(self, name):
+        lock = self.locks.get(name)
+        if lock is None:
+            with self.guard:
+                lock = self.locks.setdefault(name, threading.RLock())
+        return lock
+
+    def routes_changed(self):
+        # Every game's router drops its cached routes on its next search
+        with self.guard:
+            self.generation += 1
+
+    def edit(self, name):
+        # Rooms are changed in place for everyone; the caller holds lock(name).
+        # There are no undo snapshots to copy for.
+        room = self.changed.get(name)
+        if room is None:
+            room = self.changed[name] = self.template.rooms[name].copy()
+        room.view = None
+        return room
@@ -0,0 +1,240 @@
+# world_data.py
+#
+# Worlds stored as data instead of code. A world is two files:
+#
+#   <name>.jsonl  one room per line:
+#                 {"name": ..., "description": ..., "exits": {"north": "Library"},
+#                  "hidden_exits": {...}, "locked": false,
+#                  "items": ["sword"], "enemy": "Goblin"}
+#   <name>.idx    the prebuilt index: a JSON header line (start room,
+#                 stranger location, quest reward, room count), then the room
+#                 names separated by newlines, then the byte offset of every
+#                 line of the .jsonl as little-endian int64s (count + 1 of
+#                 them, the last being the end of the file)
+#
+# Loading a world only reads the index. Rooms are parsed when the player
+# enters or comes next to them and are kept in an LRU cache, so a very large
+# world starts quickly and uses a bounded amount of memory.
+#
+# Rebuild a world's index with:  python world_data.py index worlds/castle.jsonl
+
+import json
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from entities import ItemBag, Room
+from world import WorldTemplate, freeze_room, make_item, make_enemy
+
+INDEX_VERSION = 1
+
+def index_path(path):
+    return os.path.splitext(path)[0] + '.idx'
+
+def room_to_record(room):
+    return {
+        'name': room.name,
+        'description': room.description,
+        'exits': dict(room.exits),
+        'hidden_exits': dict(room.hidden_exits),
+        'locked': room.locked,
+        'items': room.items.names(),
+        'enemy': room.enemy.name if room.enemy else None,
+    }
+
+def record_to_room(record):
+    room = Room(record['name'], record['description'])
+    room.exits = record.get('exits', {})
+    room.hidden_exits = record.get('hidden_exits', {})
+    room.locked = record.get('locked', False)
+    room.items = ItemBag(make_item(name) for name in record.get('items', ()))
+    enemy = record.get('enemy')
+    room.enemy = make_enemy(enemy) if enemy else None
+    return room
+
+def write_world(path, records, start, stranger_location=None, quest_reward='ring of power'):
+    # Records are written as they arrive, so they can come from a generator.
+    # Names are kept as one bytes buffer rather than a list of strings, which
+    # takes a fraction of the memory for a million rooms.
+    names_data = bytearray()
+    offsets = array('q', [0])
+    with open(path, 'wb') as f:
+        for record in records:
+            f.write((json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8'))
+            if len(offsets) > 1:
+                names_data += b'\n'
+            names_data += record['name'].encode('utf-8')
+            offsets.append(f.tell())
+    write_index(path, names_data, offsets, start, stranger_location, quest_reward)
+
+def write_index(path, names_data, offsets, start, stranger_location=None, quest_reward='ring of power'):
+    # names_data is the room names joined with newlines, encoded as UTF-8
+    header = {
+        'version': INDEX_VERSION,
+        'start': start,
+        'stranger_location': stranger_location,
+        'quest_reward': quest_reward,
+        'count': len(offsets) - 1,
+        'names_size': len(names_data),
+    }
+    offsets = array('q', offsets)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    with open(index_path(path), 'wb') as f:
+        f.write((json.dumps(header, separators=(',', ':')) + '\n').encode('utf-8'))
+        f.write(names_data)
+        f.write(offsets.tobytes())
+
+def read_index(path):
+    with open(index_path(path), 'rb') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path(path)}: unsupported index version {header.get('version')!r}")
+        names = f.read(header['names_size']).decode('utf-8').split('\n') if header['count'] else []
+        offsets = array('q')
+        offsets.frombytes(f.read())
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return header, names, offsets
+
+def rebuild_index(path):
+    # Recreate the .idx for a hand-edited .jsonl, keeping its header fields
+    header, names, offsets = read_index(path)
+    names = []
+    offsets = array('q', [0])
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                names.append(json.loads(line)['name'])
+                offsets.append(offsets[-1] + len(line))
+            else:
+                offsets[-1] += len(line)
+    write_index(path, '\n'.join(names).encode('utf-8'), offsets, header['start'], header['stranger_location'], header['quest_reward'])
+
+# Define the RoomPager class
+class RoomPager:
+    # Read-only mapping {room name: Room} that parses rooms on demand
+    def __init__(self, path, names, offsets, cache_size):
+        self.path = path
+        self.positions = {name: position for position, name in enumerate(names)}
+        self.offsets = offsets
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()  # Templates are shared by server threads
+        self.file = open(path, 'rb')
+        self.loads = 0
+
+    def __getitem__(self, name):
+        with self.lock:
+            room = self.cache.get(name)
+            if room is not None:
+                self.cache.move_to_end(name)
+                return room
+            position = self.positions[name]
+            offset = self.offsets[position]
+            self.file.seek(offset)
+            room = freeze_room(record_to_room(json.loads(self.file.read(self.offsets[position + 1] - offset))))
+            self.loads += 1
+            self.cache[name] = room
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return room
+
+    def route_info(self, name):
+        # (exits, locked) of a room. A room that is not cached is read but not
+        # added to the cache, so a route search does not push out the rooms
+        # around the player.
+        with self.lock:
+            room = self.cache.get(name)
+            if room is not None:
+                return room.exits, room.locked
+            position = self.positions[name]
+            offset = self.offsets[position]
+            self.file.seek(offset)
+            record = json.loads(self.file.read(self.offsets[position + 1] - offset))
+            self.loads += 1
+        return record.get('exits', {}), record.get('locked', False)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def keys(self):
+        return self.positions.keys()
+
+    def values(self):
+        return (self[name] for name in self.positions)
+
+    def items(self):
+        return ((name, self[name]) for name in self.positions)
+
+    def close(self):
+        self.file.close()
+
+# Define the PagedWorldTemplate class
+class PagedWorldTemplate(WorldTemplate):
+    def __init__(self, path, cache_size=1024):
+        header, names, offsets = read_index(path)
+        self.path = path
+        self.rooms = RoomPager(path, names, offsets, cache_size)
+        self.start = header['start']
+        self.stranger_location = header['stranger_location']
+        self.quest_reward = make_item(header['quest_reward']) if header['quest_reward'] else None
+        self.names = None  # {lowercase name: room name}, built on first lookup (see WorldTemplate.find)
+
+    def visit(self, name):
+        # Page in the room the player is entering and the rooms next to it
+        room = self.rooms[name]
+        for neighbour in list(room.exits.values()) + list(room.hidden_exits.values()):
+            self.rooms[neighbour]
+
+    def route_info(self, name):
+        return self.rooms.route_info(name)
+
+CASTLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worlds', 'castle.jsonl')
+
+# One template per world file, shared by every Game in the process
+_worlds = {}
+_worlds_lock = threading.Lock()
+
+def load_world(path, cache_size=1024):
+    path = os.path.abspath(path)
+    with _worlds_lock:
+        if path not in _worlds:
+            _worlds[path] = PagedWorldTemplate(path, cache_size)
+        return _worlds[path]
+
+def default_world():
+    return load_world(CASTLE)
+
+def read_world(path=CASTLE):
+    # The whole world parsed into an in-memory WorldTemplate, for a
+    # world.SharedWorld: its rooms are read by many threads at once, which
+    # a RoomPager would serialize on its lock and LRU
+    header, names, offsets = read_index(path)
+    rooms = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                room = record_to_room(json.loads(line))
+                rooms[room.name] = room
+    reward = make_item(header['quest_reward']) if header['quest_reward'] else None
+    return WorldTemplate(rooms, header['start'], header['stranger_location'], reward)
+
+def main(argv):
+    if len(argv) == 2 and argv[0] == 'index':
+        rebuild_index(argv[1])
+        print(f"Wrote {index_path(argv[1])}")
+    else:
+        print("Usage: python world_data.py index <world.jsonl>")
+
+# Main entry point
+if __name__ == "__main__":
+    main(sys.argv[1:])
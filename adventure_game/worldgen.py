@@ -0,0 +1,123 @@
+# worldgen.py
+#
+# Procedural worlds for testing how the game scales. Rooms are laid out on a
+# grid, generated one row at a time and streamed straight into
+# world_data.write_world, so only the current row (plus the room names for
+# the index) is ever in memory. A million-room world is written without
+# building a million Room objects.
+#
+# Every row is a corridor from west to east, and the first room of every row
+# leads down to the next row, so every room can be reached from the start.
+# Extra passages between rows make shortcuts; some of them are hidden and
+# have to be found with 'search'. A few rooms are locked, and keys are
+# scattered around. Enemies and treasure come from the same tables as the
+# game's random spawns.
+#
+# Run with:  python worldgen.py worlds/huge.jsonl --rooms 1000000
+
+import argparse
+import math
+import os
+import random
+import time
+
+from world import RANDOM_ENEMIES, RANDOM_TREASURES
+from world_data import write_world
+
+ROOM_KINDS = ['Hall', 'Corridor', 'Cellar', 'Gallery', 'Chamber', 'Vault', 'Chapel', 'Workshop', 'Cave']
+DESCRIPTIONS = [
+    'Dust hangs in the still air.',
+    'Water drips somewhere in the dark.',
+    'Faded tapestries cover the walls.',
+    'The floor is worn smooth by countless feet.',
+    'Cold light falls through a narrow window.',
+    'Broken furniture is piled in a corner.',
+]
+
+# Chances per room or per passage
+PASSAGE_CHANCE = 0.3   # Extra passage down to the next row
+HIDDEN_CHANCE = 0.2    # Share of extra passages that must be searched for
+LOCKED_CHANCE = 0.03
+ENEMY_CHANCE = 0.1
+TREASURE_CHANCE = 0.25
+POTION_CHANCE = 0.08
+KEY_CHANCE = 0.04
+
+def room_name(x, y):
+    # Depends only on the position, so exits can name rooms not generated yet
+    return f"{ROOM_KINDS[(x * 7 + y * 5) % len(ROOM_KINDS)]} {x},{y}"
+
+def generate_rows(rooms, seed=0):
+    # Yields one list of room records per grid row
+    rng = random.Random(seed)
+    width = max(1, math.isqrt(rooms - 1) + 1) if rooms > 1 else 1
+    names = [room_name(x, 0) for x in range(min(width, rooms))]
+    up = {}  # {x: name of the room above} for passages from the previous row
+    y = 0
+    first = 0
+    while first < rooms:
+        count = min(width, rooms - first)
+        next_count = min(width, rooms - first - count)
+        next_names = [room_name(x, y + 1) for x in range(next_count)]
+        down = {}
+        row = []
+        for x in range(count):
+            record = {
+                'name': names[x],
+                'description': rng.choice(DESCRIPTIONS),
+                'exits': {},
+                'hidden_exits': {},
+                'locked': (x, y) != (0, 0) and rng.random() < LOCKED_CHANCE,
+                'items': [],
+                'enemy': rng.choice(RANDOM_ENEMIES) if rng.random() < ENEMY_CHANCE else None,
+            }
+            if x in up:
+                record['exits']['north'] = up[x]
+            if x > 0:
+                record['exits']['west'] = names[x - 1]
+            if x + 1 < count:
+                record['exits']['east'] = names[x + 1]
+            if x < next_count and (x == 0 or rng.random() < PASSAGE_CHANCE):
+                if x > 0 and rng.random() < HIDDEN_CHANCE:
+                    record['hidden_exits']['south'] = next_names[x]
+                else:
+                    record['exits']['south'] = next_names[x]
+                down[x] = names[x]
+            if rng.random() < TREASURE_CHANCE:
+                record['items'].append(rng.choice(RANDOM_TREASURES))
+            if rng.random() < POTION_CHANCE:
+                record['items'].append('health potion')
+            if rng.random() < KEY_CHANCE:
+                record['items'].append('key')
+            row.append(record)
+        yield row
+        names, up = next_names, down
+        first += count
+        y += 1
+
+def generate(rooms, seed=0):
+    # Yields room records one at a time, for world_data.write_world
+    for row in generate_rows(rooms, seed):
+        yield from row
+
+def write_generated(path, rooms, seed=0):
+    # Returns the name of the start room
+    start = room_name(0, 0)
+    write_world(path, generate(rooms, seed), start, stranger_location=start)
+    return start
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large world for testing.")
+    parser.add_argument('path', help="where to write the .jsonl (the .idx goes next to it)")
+    parser.add_argument('--rooms', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    start = write_generated(args.path, args.rooms, args.seed)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(args.path)
+    print(f"Wrote {args.rooms:,} rooms to {args.path} ({size / 1e6:.1f} MB) in {elapsed:.1f}s; start room: {start}")
+
+# Main entry point
+if __name__ == "__main__":
+    main()